@@ -60,6 +60,8 @@ class Settings(BaseSettings):
     LARGE_FILE_THRESHOLD_MB: float = 5.0  # Aligned with Technical Guide
     LARGE_FILE_PAGE_THRESHOLD: int = 50
     MAX_CONCURRENT_EXTRACTIONS: int = 5  # Optimal for stability/rate-limits
+    EXTRACTION_CACHE_ENABLED: bool = True  # Reuse results for identical document bytes
+    EXTRACTION_CACHE_SIZE: int = 128  # Results kept in memory per worker
 
     # Celery
     @property
@@ -31,6 +31,17 @@ class DataCompleteness(str, Enum):
     ADDRESS_ONLY = "address_only"
     INCOMPLETE = "incomplete"
 
+# Relative ordering of members (higher is better), attached to each member so
+# quality comparisons are plain integer compares
+for _rank, _level in enumerate((ConfidenceLevel.LOW, ConfidenceLevel.MEDIUM, ConfidenceLevel.HIGH)):
+    _level.rank = _rank
+for _rank, _level in enumerate((
+    DataCompleteness.INCOMPLETE, DataCompleteness.PARTIAL_ADDRESS, DataCompleteness.PARTIAL_NAME,
+    DataCompleteness.NAME_ONLY, DataCompleteness.ADDRESS_ONLY, DataCompleteness.COMPLETE
+)):
+    _level.rank = _rank
+del _rank, _level
+
 class SourceLocation(BaseModel):
     """Location information for extracted data"""
     page: int
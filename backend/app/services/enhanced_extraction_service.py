@@ -5,9 +5,15 @@ Step 2: JSON Generation with validation
 """
 
 import json
+import hashlib
+import re
+import time
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+import itertools
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 
 from app.models.enhanced_extraction import (
@@ -22,6 +28,394 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+    logger.warning("rapidfuzz could not be imported. Applicant deduplication will use substring matching.")
+
+try:
+    import re2
+except ImportError:
+    # google-re2 is optional; the company name pattern falls back to the stdlib engine
+    re2 = None
+
+# Maximum amount of document text included in the evidence gathering prompt
+MAX_EVIDENCE_TEXT_CHARS = 50000
+
+# Marker emitted by LLMService._extract_text_locally ahead of AcroForm field values
+FORM_FIELD_SENTINEL = "--- FORM FIELD DATA ---"
+
+# Number of per-document extraction method decisions kept in memory
+EXTRACTION_METHOD_CACHE_SIZE = 512
+
+# Read size when hashing a document from disk
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Enum lookups by value, so LLM-supplied strings are coerced without calling
+# the Enum constructor (unknown values fall back to a default instead of raising)
+_CONFIDENCE_LEVELS = {level.value: level for level in ConfidenceLevel}
+_COMPLETENESS_LEVELS = {level.value: level for level in DataCompleteness}
+
+# Keys the LLM has been seen to use for inventor/applicant lists, in priority order
+INVENTOR_EVIDENCE_KEYS = ("inventors_evidence", "inventors")
+APPLICANT_EVIDENCE_KEYS = (
+    "applicants_evidence", "applicants", "companies", "assignees", "organizations", "entities"
+)
+
+# Default source sections for evidence the LLM reports without one
+INVENTOR_INFO_SECTION = "inventor_info"
+APPLICANT_INFO_SECTION = "applicant_info"
+ENTITY_STATUS_SECTION = "entity_status"
+
+# Sections searched for applicants missing from the primary applicant list,
+# read from "<section>_evidence" in the evidence response
+SECONDARY_APPLICANT_SECTIONS = ("correspondence", "header", "footer", "letterhead")
+
+# Company names like "Company Name Inc." or "Company Name Corporation". The
+# pattern has no backreferences or lookarounds, so it runs under RE2's
+# linear-time engine when available.
+_COMPANY_NAME_PATTERN = r'([A-Z][a-zA-Z\s&]+(?:Inc\.|LLC|Corp\.|Corporation|Ltd\.|Co\.|Company|LLP))'
+_COMPANY_NAME_RE = (re2 or re).compile(_COMPANY_NAME_PATTERN)
+
+# US ZIP (+4) codes and UK postcodes, used to flag inventor addresses missing a postal code
+_POSTAL_CODE_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b|\b[A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2}\b")
+
+# Trailing legal-form words of an organization name and their canonical form.
+# Names with different legal forms ("ABC Co" vs "ABC Corp") are distinct
+# entities; a name without one may match either.
+_LEGAL_SUFFIXES = {
+    "inc": "inc", "incorporated": "inc",
+    "corp": "corp", "corporation": "corp",
+    "co": "co", "company": "co",
+    "ltd": "ltd", "limited": "ltd",
+    "llc": "llc", "llp": "llp",
+}
+
+# Punctuation/whitespace collapsed when comparing organization names
+_NON_WORD_RE = re.compile(r"\W+")
+
+# fuzz.ratio score of the names without legal suffix at or above which two
+# organization names are the same entity
+APPLICANT_SIMILARITY_THRESHOLD = 90
+
+# Organization name pairs whose similarity verdict is memoized
+NAME_MATCH_CACHE_SIZE = 4096
+
+
+
+def _split_legal_suffix(name: str) -> Tuple[str, Optional[str]]:
+    """
+    (name without legal suffix, canonical legal suffix or None) of a
+    normalized organization name
+    """
+    core, _, last = name.rpartition(" ")
+    suffix = _LEGAL_SUFFIXES.get(last)
+    if core and suffix:
+        return core, suffix
+    return name, None
+
+
+def _legal_suffixes_compatible(suffix1: Optional[str], suffix2: Optional[str]) -> bool:
+    return suffix1 is None or suffix2 is None or suffix1 == suffix2
+
+
+def _organization_names_match(name1: str, name2: str) -> bool:
+    """
+    Compare two normalized organization names. Legal suffixes must agree
+    when both names have one; the rest of the names must be equal, or, with
+    rapidfuzz, near-identical (spacing and typos, not extra words).
+    """
+    if name1 == name2:
+        return True
+    # Both comparisons are symmetric, so canonicalize the pair for the cache
+    if name2 < name1:
+        name1, name2 = name2, name1
+    return _cached_names_match(name1, name2)
+
+
+@lru_cache(maxsize=NAME_MATCH_CACHE_SIZE)
+def _cached_names_match(name1: str, name2: str) -> bool:
+    core1, suffix1 = _split_legal_suffix(name1)
+    core2, suffix2 = _split_legal_suffix(name2)
+    if not _legal_suffixes_compatible(suffix1, suffix2):
+        return False
+    if core1 == core2:
+        return True
+    return fuzz is not None and fuzz.ratio(core1, core2) >= APPLICANT_SIMILARITY_THRESHOLD
+
+
+def _similar_name_pairs(names: List[str]) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i < j) of distinct normalized organization names that refer
+    to the same entity.
+    """
+    if len(names) < 2:
+        return []
+    return [
+        (i, j)
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+        if _organization_names_match(names[i], names[j])
+    ]
+
+
+def _find_root(parent: List[int], index: int) -> int:
+    """
+    Union-find lookup with path halving
+    """
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
+
+
+# Single-value evidence fields: (field name, response keys in priority order,
+# default section). _normalize_response stores each under "<field>_evidence".
+_SINGLE_VALUE_EVIDENCE_FIELDS = (
+    ("title", ("title_evidence", "invention_title"), None),
+    ("application_number", ("application_number_evidence", "application_number"), None),
+    ("filing_date", ("filing_date_evidence",), None),
+    ("entity_status", ("entity_status_evidence", "entity_status", "entity_status_information"), ENTITY_STATUS_SECTION),
+)
+
+
+def _normalize_evidence(value: Any, default_section: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Collapse the shapes the LLM uses for a single evidence value (evidence dict,
+    direct {"text", "source_page", ...} dict, a list of either, or a bare
+    string) into an evidence-format dict. None when there is no text.
+    """
+    if isinstance(value, list):
+        if not value:
+            return None
+        value = value[0]
+    
+    if isinstance(value, dict):
+        text = value.get("raw_text") or value.get("text") or value.get("value")
+        if not text:
+            return None
+        return {
+            "raw_text": text,
+            "page": value.get("page") or value.get("source_page") or 1,
+            "section": value.get("section") or value.get("source_section") or default_section,
+            "confidence": value.get("confidence", "medium")
+        }
+    
+    if isinstance(value, str) and value and value != "null":
+        return {"raw_text": value, "page": 1, "section": default_section, "confidence": "medium"}
+    
+    return None
+
+
+def _normalize_response(evidence_response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a shallow copy of the evidence response where every single-value
+    field is stored under its canonical "<field>_evidence" key as an
+    evidence-format dict (or None), so parsers can read it without type checks.
+    """
+    normalized = dict(evidence_response)
+    log_raw_data = logger.isEnabledFor(logging.DEBUG)
+    
+    for field_name, aliases, default_section in _SINGLE_VALUE_EVIDENCE_FIELDS:
+        evidence_data = None
+        for alias in aliases:
+            if alias in evidence_response:
+                if log_raw_data:
+                    logger.debug("%s RAW DATA (%s): %s", field_name.upper(), alias, evidence_response[alias])
+                evidence_data = _normalize_evidence(evidence_response[alias], default_section)
+                if evidence_data:
+                    break
+        normalized[f"{field_name}_evidence"] = evidence_data
+    
+    return normalized
+
+
+def content_digest(file_path: str, file_content: Optional[bytes]) -> str:
+    """
+    SHA-256 of the document bytes, streaming from disk when no content is given.
+    Identifies a document for the extraction method and result caches.
+    """
+    digest = hashlib.sha256()
+    if file_content is not None:
+        # Length prefix keeps the digest unambiguous if more parts are ever hashed
+        digest.update(len(file_content).to_bytes(8, "big"))
+        digest.update(file_content)
+        return digest.hexdigest()
+    
+    with open(file_path, "rb") as f:
+        f.seek(0, 2)
+        digest.update(f.tell().to_bytes(8, "big"))
+        f.seek(0)
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _report_progress(
+    progress_callback: Optional[callable],
+    progress: int,
+    message: str
+) -> Optional[asyncio.Task]:
+    """
+    Schedule a progress update without waiting for it to be delivered
+    """
+    if not progress_callback:
+        return None
+    task = asyncio.create_task(progress_callback(progress, message))
+    task.add_done_callback(_log_progress_failure)
+    return task
+
+
+def _log_progress_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.warning("Progress update failed: %s", task.exception())
+
+
+def _split_into_chunks(
+    text: str,
+    max_chars: int = MAX_EVIDENCE_TEXT_CHARS,
+    overlap: int = 2000
+) -> List[str]:
+    """
+    Split document text into overlapping chunks of at most max_chars,
+    preferring to break at page markers and then at paragraph breaks.
+    """
+    chunks = []
+    start = 0
+    text_length = len(text)
+    
+    while start < text_length:
+        end = min(text_length, start + max_chars)
+        if end < text_length:
+            # Only look for a break point in the second half of the window
+            floor = start + max_chars // 2
+            break_at = text.rfind("\n--- PAGE ", floor, end)
+            if break_at == -1:
+                break_at = text.rfind("\n\n", floor, end)
+            if break_at != -1:
+                end = break_at
+        
+        chunks.append(text[start:end])
+        if end >= text_length:
+            break
+        start = max(end - overlap, start + 1)
+    
+    return chunks
+
+
+def _needs_fragmentation_cleaning(text: str) -> bool:
+    """
+    Cheap pre-check for word-per-line fragmentation: samples the first 10 KB
+    and reports whether more than 30% of its lines hold three words or fewer.
+    """
+    lines = text[:10000].splitlines()
+    short_lines = sum(1 for line in lines if len(line.split()) <= 3)
+    return short_lines / max(1, len(lines)) > 0.3
+
+
+def _coerce_page(page: Any) -> int:
+    """
+    Page numbers arrive from the LLM as ints, numeric strings or null
+    """
+    if isinstance(page, int):
+        return page
+    try:
+        return int(page)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _coerce_section(section: Any) -> Optional[str]:
+    """
+    Section labels arrive from the LLM as strings, null, or occasionally
+    numbers or nested objects
+    """
+    if section is None or isinstance(section, str):
+        return section
+    return str(section)
+
+
+# Fields copied as-is from the generated JSON into EnhancedInventor/EnhancedApplicant
+INVENTOR_RESULT_FIELDS = (
+    "given_name", "middle_name", "family_name", "full_name", "street_address",
+    "city", "state", "postal_code", "country", "citizenship"
+)
+APPLICANT_RESULT_FIELDS = (
+    "organization_name", "individual_given_name", "individual_family_name", "street_address",
+    "city", "state", "postal_code", "country", "customer_number", "email_address"
+)
+
+
+def _result_values(data: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Pick the given fields from a generated inventor/applicant entry, with the
+    completeness and confidence score coerced leniently
+    """
+    values = {field: data.get(field) for field in fields}
+    values["completeness"] = _COMPLETENESS_LEVELS.get(data.get("completeness"), DataCompleteness.INCOMPLETE)
+    values["confidence_score"] = float(data.get("confidence_score") or 0.5)
+    return values
+
+
+def _text_value(data: Any) -> str:
+    """
+    Text of a field given either directly or as a {"text": ...} dict
+    """
+    text = data.get("text") if isinstance(data, dict) else None
+    return text if text is not None else str(data)
+
+
+def _make_evidence_item(
+    field_name: str,
+    raw_text: Any,
+    page: Any,
+    section: Optional[str],
+    confidence: ConfidenceLevel,
+    extraction_method: ExtractionMethod,
+    source_text: Optional[str] = None
+) -> EvidenceItem:
+    """
+    Build an EvidenceItem for one field read from the LLM response.
+    source_text is the surrounding text, when it differs from raw_text.
+    """
+    # Fields are already normalized here, so skip Pydantic validation and
+    # only coerce the values the LLM is known to send loosely typed.
+    raw_text = raw_text if isinstance(raw_text, str) else str(raw_text)
+    source_text = source_text if source_text is not None else raw_text
+    return EvidenceItem.model_construct(
+        field_name=field_name,
+        raw_text=raw_text,
+        source_location=SourceLocation.model_construct(
+            page=_coerce_page(page),
+            section=_coerce_section(section),
+            raw_text=source_text if isinstance(source_text, str) else str(source_text),
+            extraction_method=extraction_method
+        ),
+        confidence=confidence
+    )
+
+
+def _evidence_item_from_dict(
+    field_name: str,
+    data: Dict[str, Any],
+    extraction_method: ExtractionMethod
+) -> EvidenceItem:
+    """
+    Build an EvidenceItem from an evidence-format dict
+    ({"raw_text", "page", "section", "confidence"})
+    """
+    get = data.get
+    return _make_evidence_item(
+        field_name,
+        data["raw_text"],
+        get("page", 1),
+        get("section"),
+        _CONFIDENCE_LEVELS.get(get("confidence"), ConfidenceLevel.MEDIUM),
+        extraction_method
+    )
+
+
 class EnhancedExtractionService:
     """
     Enhanced extraction service implementing systematic two-step extraction
@@ -31,38 +425,51 @@ class EnhancedExtractionService:
         self.llm_service = llm_service or LLMService()
         self.evidence_gathering_prompts = EvidenceGatheringPrompts()
         self.json_generation_prompts = JSONGenerationPrompts()
+        # Extraction methods by document content digest, LRU ordered
+        self._extraction_method_cache: "OrderedDict[str, ExtractionMethod]" = OrderedDict()
+        # Response keys that held inventors/applicants in the last parsed response
+        self._last_inventors_key: Optional[str] = None
+        self._last_applicants_key: Optional[str] = None
         
     async def extract_with_two_step_process(
         self,
         file_path: str,
         file_content: Optional[bytes] = None,
         document_type: str = "unknown",
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        content_hash: Optional[str] = None
     ) -> EnhancedExtractionResult:
         """
-        Main entry point for two-step extraction process
+        Main entry point for two-step extraction process.
+        Pass content_hash (content_digest of the document) when the caller
+        already computed it, so the document is not hashed again.
         """
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
+        
+        # Name pairs rarely repeat across documents; keep the match cache per document
+        _cached_names_match.cache_clear()
+        
+        # Intermediate progress updates run alongside the pipeline instead of
+        # blocking it; they are flushed before the final update, or cancelled
+        # on failure so a late update cannot overwrite the failed status.
+        progress_tasks = []
         
         try:
-            if progress_callback:
-                await progress_callback(10, "Starting evidence gathering phase...")
+            progress_tasks.append(_report_progress(progress_callback, 10, "Starting evidence gathering phase..."))
             
             # Step 1: Evidence Gathering
             document_evidence = await self._gather_evidence_systematic(
-                file_path, file_content, document_type, progress_callback
+                file_path, file_content, document_type, progress_callback, content_hash
             )
             
-            if progress_callback:
-                await progress_callback(60, "Generating structured data from evidence...")
+            progress_tasks.append(_report_progress(progress_callback, 60, "Generating structured data from evidence..."))
             
             # Step 2: JSON Generation from Evidence
             extraction_result = await self._generate_json_from_evidence(
                 document_evidence, progress_callback
             )
             
-            if progress_callback:
-                await progress_callback(90, "Validating and finalizing results...")
+            progress_tasks.append(_report_progress(progress_callback, 90, "Validating and finalizing results..."))
             
             # Step 3: Validation and Quality Assessment
             validated_result = await self._validate_and_enhance_result(
@@ -70,28 +477,36 @@ class EnhancedExtractionService:
             )
             
             # Add processing metadata
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             validated_result.extraction_metadata.processing_time = processing_time
             
             if progress_callback:
+                await asyncio.gather(*filter(None, progress_tasks), return_exceptions=True)
                 await progress_callback(100, "Extraction completed successfully")
             
             return validated_result
             
         except Exception as e:
-            logger.error(f"Two-step extraction failed: {e}", exc_info=True)
+            logger.error("Two-step extraction failed: %s", e, exc_info=True)
             raise DataProcessingError(
                 f"Enhanced extraction failed: {str(e)}",
                 error_code="EXTRACTION_FAILED",
                 context={"file_path": file_path, "document_type": document_type}
             )
+        finally:
+            pending_tasks = [task for task in progress_tasks if task and not task.done()]
+            for task in pending_tasks:
+                task.cancel()
+            if pending_tasks:
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
     
     async def _gather_evidence_systematic(
         self,
         file_path: str,
         file_content: Optional[bytes],
         document_type: str,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        content_hash: Optional[str] = None
     ) -> DocumentEvidence:
         """
         Step 1: Systematic evidence gathering from document
@@ -99,7 +514,7 @@ class EnhancedExtractionService:
         try:
             # Determine extraction method based on document analysis
             extraction_method = await self._determine_extraction_method(
-                file_path, file_content
+                file_path, file_content, content_hash
             )
             
             # Get appropriate evidence gathering prompt
@@ -118,6 +533,15 @@ class EnhancedExtractionService:
             if extraction_method in [ExtractionMethod.TEXT_EXTRACTION, ExtractionMethod.FORM_FIELDS]:
                 text_content = await self.llm_service._extract_text_locally(file_path, file_content)
             
+            if text_content:
+                text_content = await self._clean_evidence_text(text_content)
+            
+            if text_content and len(text_content) > MAX_EVIDENCE_TEXT_CHARS:
+                # Too large for one prompt - gather evidence per chunk and merge
+                return await self._gather_evidence_chunked(
+                    evidence_prompt, text_content, extraction_method
+                )
+            
             # Generate evidence using LLM
             evidence_response = await self._generate_evidence_with_llm(
                 evidence_prompt, file_obj, text_content
@@ -131,42 +555,179 @@ class EnhancedExtractionService:
             return document_evidence
             
         except Exception as e:
-            logger.error(f"Evidence gathering failed: {e}", exc_info=True)
+            logger.error("Evidence gathering failed: %s", e, exc_info=True)
             raise EvidenceGatheringError(
                 f"Failed to gather evidence: {str(e)}",
                 error_code="EVIDENCE_GATHERING_FAILED",
                 context={"file_path": file_path, "extraction_method": extraction_method}
             )
     
+    async def _clean_evidence_text(self, text_content: str) -> str:
+        """
+        Undo word-per-line fragmentation before the single-prompt vs chunked
+        decision, since cleaning often shrinks such documents under the limit
+        """
+        # ══════════════════════════════════════════════════════════════════
+        # APPLY FRAGMENTED TEXT CLEANING - Fix for word-per-line PDFs
+        # ══════════════════════════════════════════════════════════════════
+        if not _needs_fragmentation_cleaning(text_content):
+            # Already well-formed (e.g. cleaned per page during local extraction)
+            return text_content
+        
+        # Clean one character past the prompt budget: a shorter result means
+        # the whole document fits in one prompt and the rest need not be
+        # cleaned. Regex-heavy on large documents, so keep it off the event loop.
+        cleaned_text_content = await asyncio.to_thread(
+            clean_fragmented_text,
+            text_content,
+            max_chars=MAX_EVIDENCE_TEXT_CHARS + 1
+        )
+        if len(cleaned_text_content) > MAX_EVIDENCE_TEXT_CHARS:
+            # Still oversized, so chunking needs all of it cleaned
+            cleaned_text_content = await asyncio.to_thread(clean_fragmented_text, text_content)
+        
+        logger.info(
+            "Enhanced extraction text cleaned: %d -> %d chars (fragmentation artifacts removed)",
+            len(text_content), len(cleaned_text_content)
+        )
+        return cleaned_text_content
+    
+    async def _gather_evidence_chunked(
+        self,
+        evidence_prompt: str,
+        text_content: str,
+        extraction_method: ExtractionMethod
+    ) -> DocumentEvidence:
+        """
+        Gather evidence from an oversized document by running the evidence
+        prompt over overlapping text chunks concurrently and merging the results
+        """
+        chunks = _split_into_chunks(text_content)
+        logger.info("Splitting %d chars into %d chunks for evidence gathering", len(text_content), len(chunks))
+        
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_EXTRACTIONS)
+        
+        async def process_chunk(chunk: str) -> DocumentEvidence:
+            async with semaphore:
+                evidence_response = await self._generate_evidence_with_llm(
+                    evidence_prompt, None, chunk
+                )
+                return await self._parse_evidence_response(evidence_response, extraction_method)
+        
+        results = await asyncio.gather(
+            *[process_chunk(chunk) for chunk in chunks], return_exceptions=True
+        )
+        
+        chunk_evidence = [r for r in results if isinstance(r, DocumentEvidence)]
+        if not chunk_evidence:
+            raise results[0]
+        if len(chunk_evidence) < len(chunks):
+            logger.warning("Evidence gathering failed for %d of %d chunks", len(chunks) - len(chunk_evidence), len(chunks))
+        
+        return self._merge_document_evidence(chunk_evidence)
+    
+    def _merge_document_evidence(self, chunk_evidence: List[DocumentEvidence]) -> DocumentEvidence:
+        """
+        Merge evidence gathered from several chunks of one document
+        """
+        merged = DocumentEvidence(
+            document_pages=max(evidence.document_pages for evidence in chunk_evidence),
+            extraction_timestamp=chunk_evidence[0].extraction_timestamp
+        )
+        
+        # Single-valued fields: keep the highest-confidence candidate (earliest on ties)
+        for field_name in ("title_evidence", "application_number_evidence", "filing_date_evidence",
+                           "entity_status_evidence", "attorney_docket_evidence"):
+            candidates = [getattr(e, field_name) for e in chunk_evidence if getattr(e, field_name)]
+            if candidates:
+                setattr(merged, field_name, max(candidates, key=lambda item: item.confidence.rank))
+        
+        # Inventors: chunks overlap, so drop repeats of the same name
+        seen_inventors = set()
+        for evidence in chunk_evidence:
+            for inventor in evidence.inventor_evidence:
+                name_key = tuple(
+                    item.raw_text.strip().lower() if item else ""
+                    for item in (inventor.given_name_evidence, inventor.family_name_evidence)
+                )
+                if any(name_key):
+                    if name_key in seen_inventors:
+                        continue
+                    seen_inventors.add(name_key)
+                merged.inventor_evidence.append(inventor)
+        
+        # Applicants: reuse the candidate deduplication/merge logic
+        merged.applicant_evidence = self._deduplicate_applicant_candidates(
+            [applicant for evidence in chunk_evidence for applicant in evidence.applicant_evidence]
+        )
+        
+        for field_name in ("correspondence_evidence", "priority_evidence"):
+            seen_text = set()
+            items = getattr(merged, field_name)
+            for evidence in chunk_evidence:
+                for item in getattr(evidence, field_name):
+                    if item.raw_text not in seen_text:
+                        seen_text.add(item.raw_text)
+                        items.append(item)
+        
+        return merged
+    
     async def _determine_extraction_method(
         self,
         file_path: str,
-        file_content: Optional[bytes]
+        file_content: Optional[bytes],
+        content_hash: Optional[str] = None
     ) -> ExtractionMethod:
         """
-        Determine the best extraction method for the document
+        Determine the best extraction method for the document.
+        Decisions are cached by content hash so re-uploads skip detection.
         """
+        cache_key = content_hash
+        if cache_key is None and file_content:
+            cache_key = await asyncio.to_thread(content_digest, file_path, file_content)
+        
+        cached_method = self._extraction_method_cache.get(cache_key) if cache_key else None
+        if cached_method is not None:
+            self._extraction_method_cache.move_to_end(cache_key)
+            return cached_method
+        
         try:
-            # Check for XFA forms first
-            xfa_data = await self.llm_service._extract_xfa_data(file_path, file_content)
-            if xfa_data:
-                return ExtractionMethod.XFA_FORM
-            
-            # Check text extraction quality
-            text_content = await self.llm_service._extract_text_locally(file_path, file_content)
-            if text_content and len(text_content.strip()) > 500:
-                # Check for form fields
-                if "--- FORM FIELD DATA ---" in text_content:
-                    return ExtractionMethod.FORM_FIELDS
-                else:
-                    return ExtractionMethod.TEXT_EXTRACTION
-            
-            # Fallback to vision analysis
-            return ExtractionMethod.VISION_ANALYSIS
-            
+            extraction_method = await self._detect_extraction_method(file_path, file_content)
         except Exception as e:
-            logger.warning(f"Could not determine extraction method: {e}")
+            logger.warning("Could not determine extraction method: %s", e)
             return ExtractionMethod.VISION_ANALYSIS
+        
+        if cache_key:
+            self._extraction_method_cache[cache_key] = extraction_method
+            if len(self._extraction_method_cache) > EXTRACTION_METHOD_CACHE_SIZE:
+                self._extraction_method_cache.popitem(last=False)
+        
+        return extraction_method
+    
+    async def _detect_extraction_method(
+        self,
+        file_path: str,
+        file_content: Optional[bytes]
+    ) -> ExtractionMethod:
+        """
+        Inspect the document to pick an extraction method
+        """
+        # Check for XFA forms first
+        xfa_data = await self.llm_service._extract_xfa_data(file_path, file_content)
+        if xfa_data:
+            return ExtractionMethod.XFA_FORM
+        
+        # Check text extraction quality
+        text_content = await self.llm_service._extract_text_locally(file_path, file_content)
+        if text_content and len(text_content.strip()) > 500:
+            # Check for form fields
+            if FORM_FIELD_SENTINEL in text_content:
+                return ExtractionMethod.FORM_FIELDS
+            else:
+                return ExtractionMethod.TEXT_EXTRACTION
+        
+        # Fallback to vision analysis
+        return ExtractionMethod.VISION_ANALYSIS
     
     async def _generate_evidence_with_llm(
         self,
@@ -186,22 +747,9 @@ class EnhancedExtractionService:
                     retries=3
                 )
             elif text_content:
-                # Text-only analysis
-                # ══════════════════════════════════════════════════════════════════
-                # APPLY FRAGMENTED TEXT CLEANING - Fix for word-per-line PDFs
-                # ══════════════════════════════════════════════════════════════════
-                original_length = len(text_content)
-                cleaned_text_content = clean_fragmented_text(text_content)
-                cleaned_length = len(cleaned_text_content)
-                
-                if original_length != cleaned_length:
-                    logger.info(
-                        f"Enhanced extraction text cleaned: {original_length} -> {cleaned_length} chars "
-                        f"(removed {original_length - cleaned_length} fragmentation artifacts)"
-                    )
-                # ══════════════════════════════════════════════════════════════════
-                
-                full_prompt = f"{prompt}\n\n## DOCUMENT TEXT CONTENT:\n{cleaned_text_content[:50000]}"
+                # Text-only analysis; fragmentation was cleaned by _clean_evidence_text
+                full_prompt = f"{prompt}\n\n## DOCUMENT TEXT CONTENT:\n{text_content[:MAX_EVIDENCE_TEXT_CHARS]}"
+                logger.debug("Evidence prompt size: %d chars (~%d tokens)", len(full_prompt), len(full_prompt) // 4)
                 response = await self.llm_service.generate_structured_content(
                     prompt=full_prompt,
                     retries=3
@@ -212,7 +760,7 @@ class EnhancedExtractionService:
             return response
             
         except Exception as e:
-            logger.error(f"LLM evidence generation failed: {e}")
+            logger.error("LLM evidence generation failed: %s", e)
             raise
     
     async def _parse_evidence_response(
@@ -239,73 +787,33 @@ class EnhancedExtractionService:
                 extraction_timestamp=datetime.utcnow()
             )
             
-            # Parse title evidence - FIXED: Handle array, object, and evidence formats
-            title_data = None
-            if "title_evidence" in evidence_response:
-                title_data = evidence_response["title_evidence"]
-            elif "invention_title" in evidence_response:
-                # Handle direct format from LLM
-                title_info = evidence_response["invention_title"]
-                if isinstance(title_info, list) and len(title_info) > 0:
-                    # Handle array format - take first element
-                    first_title = title_info[0]
-                    if isinstance(first_title, dict) and first_title.get("text"):
-                        title_data = {
-                            "raw_text": first_title["text"],
-                            "page": first_title.get("source_page", 1),
-                            "section": first_title.get("source_section"),
-                            "confidence": first_title.get("confidence", "medium")
-                        }
-                        logger.info(f"TITLE FOUND (array): {first_title['text']}")
-                elif isinstance(title_info, dict):
-                    # Handle both "text" and "raw_text" fields
-                    text_value = title_info.get("text") or title_info.get("raw_text")
-                    if text_value:
-                        title_data = {
-                            "raw_text": text_value,
-                            "page": title_info.get("source_page", 1),
-                            "section": title_info.get("source_section"),
-                            "confidence": title_info.get("confidence", "medium")
-                        }
-                        logger.info(f"TITLE FOUND (dict): {text_value}")
+            # Collapse the list/dict/string variants of single-value fields once
+            evidence_response = _normalize_response(evidence_response)
             
-            if title_data and title_data.get("raw_text"):
-                document_evidence.title_evidence = EvidenceItem(
-                    field_name="title",
-                    raw_text=title_data["raw_text"],
-                    source_location=SourceLocation(
-                        page=title_data.get("page", 1),
-                        section=title_data.get("section"),
-                        raw_text=title_data["raw_text"],
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(title_data.get("confidence", "medium"))
-                )
+            # Parse title evidence
+            title_data = evidence_response["title_evidence"]
+            if title_data:
+                document_evidence.title_evidence = _evidence_item_from_dict("title", title_data, extraction_method)
             
             # Parse inventor evidence - FIXED: Handle both evidence format and direct format
-            inventors_data = evidence_response.get("inventors_evidence", [])
-            if not inventors_data:
-                # Fallback: Check if LLM returned direct "inventors" format
-                inventors_data = evidence_response.get("inventors", [])
-                logger.info(f"EVIDENCE PARSING: Found {len(inventors_data)} inventors in direct format")
-            else:
-                logger.info(f"EVIDENCE PARSING: Found {len(inventors_data)} inventors in evidence format")
+            inventors_key, inventors_data = self._find_evidence_list(
+                evidence_response, INVENTOR_EVIDENCE_KEYS, self._last_inventors_key
+            )
+            if inventors_key:
+                self._last_inventors_key = inventors_key
+            logger.info("EVIDENCE PARSING: Found %d inventors in '%s' format", len(inventors_data), inventors_key)
             
             for inv_data in inventors_data:
                 inventor_evidence = self._parse_inventor_evidence(inv_data, extraction_method)
                 document_evidence.inventor_evidence.append(inventor_evidence)
             
             # Parse applicant evidence - ENHANCED: Handle multiple applicant formats and sources
-            applicants_data = evidence_response.get("applicants_evidence", [])
-            if not applicants_data:
-                # Fallback: Check multiple possible field names for applicants
-                for field_name in ["applicants", "companies", "assignees", "organizations", "entities"]:
-                    if field_name in evidence_response:
-                        applicants_data = evidence_response[field_name]
-                        logger.info(f"EVIDENCE PARSING: Found {len(applicants_data)} applicants in '{field_name}' format")
-                        break
-            else:
-                logger.info(f"EVIDENCE PARSING: Found {len(applicants_data)} applicants in evidence format")
+            applicants_key, applicants_data = self._find_evidence_list(
+                evidence_response, APPLICANT_EVIDENCE_KEYS, self._last_applicants_key
+            )
+            if applicants_key:
+                self._last_applicants_key = applicants_key
+            logger.info("EVIDENCE PARSING: Found %d applicants in '%s' format", len(applicants_data), applicants_key)
             
             # Parse primary applicant evidence
             for app_data in applicants_data:
@@ -327,19 +835,43 @@ class EnhancedExtractionService:
             self._parse_additional_evidence(evidence_response, document_evidence, extraction_method)
             
             # DIAGNOSTIC LOGGING: Track what evidence was actually parsed
-            logger.info(f"PARSED EVIDENCE SUMMARY:")
-            logger.info(f"  - Title: {'FOUND' if document_evidence.title_evidence else 'MISSING'}")
-            logger.info(f"  - App Number: {'FOUND' if document_evidence.application_number_evidence else 'MISSING'}")
-            logger.info(f"  - Entity Status: {'FOUND' if document_evidence.entity_status_evidence else 'MISSING'}")
-            logger.info(f"  - Inventors: {len(document_evidence.inventor_evidence)}")
-            logger.info(f"  - Applicants: {len(document_evidence.applicant_evidence)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("PARSED EVIDENCE SUMMARY:")
+                logger.info("  - Title: %s", "FOUND" if document_evidence.title_evidence else "MISSING")
+                logger.info("  - App Number: %s", "FOUND" if document_evidence.application_number_evidence else "MISSING")
+                logger.info("  - Entity Status: %s", "FOUND" if document_evidence.entity_status_evidence else "MISSING")
+                logger.info("  - Inventors: %d", len(document_evidence.inventor_evidence))
+                logger.info("  - Applicants: %d", len(document_evidence.applicant_evidence))
             
             return document_evidence
             
         except Exception as e:
-            logger.error(f"Evidence parsing failed: {e}")
+            logger.error("Evidence parsing failed: %s", e)
             raise DataProcessingError(f"Failed to parse evidence: {str(e)}")
     
+    def _find_evidence_list(
+        self,
+        evidence_response: Dict[str, Any],
+        keys: Tuple[str, ...],
+        preferred_key: Optional[str]
+    ) -> Tuple[Optional[str], List[Any]]:
+        """
+        Find the first non-empty list among the candidate response keys.
+        The key that matched on the previous response is tried first, since
+        the LLM tends to stick to one schema. Returns (key, data).
+        """
+        if preferred_key:
+            data = evidence_response.get(preferred_key)
+            if data:
+                return preferred_key, data
+        
+        for key in keys:
+            data = evidence_response.get(key)
+            if data:
+                return key, data
+        
+        return None, []
+    
     def _parse_inventor_evidence(
         self,
         inv_data: Dict[str, Any],
@@ -350,10 +882,15 @@ class EnhancedExtractionService:
         """
         inventor_evidence = InventorEvidence(
             sequence_number=inv_data.get("sequence_number"),
-            completeness=DataCompleteness(inv_data.get("completeness", "incomplete")),
-            overall_confidence=ConfidenceLevel(inv_data.get("confidence", "medium"))
+            completeness=_COMPLETENESS_LEVELS.get(inv_data.get("completeness"), DataCompleteness.INCOMPLETE),
+            overall_confidence=_CONFIDENCE_LEVELS.get(inv_data.get("confidence"), ConfidenceLevel.MEDIUM)
         )
         
+        # Source location shared by all fields given directly on the inventor
+        src = inv_data.get("source") or {}
+        src_page = src.get("page", 1)
+        src_section = src.get("section", INVENTOR_INFO_SECTION)
+        
         # Parse name evidence - FIXED: Handle actual LLM response structure
         # LLM returns "name" field instead of separate "given_name" and "family_name"
         if "name" in inv_data and inv_data["name"]:
@@ -366,46 +903,37 @@ class EnhancedExtractionService:
                     family_name = " ".join(name_parts[1:])
                     
                     # Create given name evidence
-                    inventor_evidence.given_name_evidence = EvidenceItem(
+                    inventor_evidence.given_name_evidence = _make_evidence_item(
                         field_name="given_name",
                         raw_text=given_name,
-                        source_location=SourceLocation(
-                            page=inv_data.get("source", {}).get("page", 1),
-                            section=inv_data.get("source", {}).get("section", "inventor_info"),
-                            raw_text=given_name,
-                            extraction_method=extraction_method
-                        ),
-                        confidence=ConfidenceLevel("medium")
+                        page=src_page,
+                        section=src_section,
+                        confidence=ConfidenceLevel.MEDIUM,
+                        extraction_method=extraction_method
                     )
                     
                     # Create family name evidence
-                    inventor_evidence.family_name_evidence = EvidenceItem(
+                    inventor_evidence.family_name_evidence = _make_evidence_item(
                         field_name="family_name",
                         raw_text=family_name,
-                        source_location=SourceLocation(
-                            page=inv_data.get("source", {}).get("page", 1),
-                            section=inv_data.get("source", {}).get("section", "inventor_info"),
-                            raw_text=family_name,
-                            extraction_method=extraction_method
-                        ),
-                        confidence=ConfidenceLevel("medium")
+                        page=src_page,
+                        section=src_section,
+                        confidence=ConfidenceLevel.MEDIUM,
+                        extraction_method=extraction_method
                     )
                     
-                    logger.info(f"INVENTOR NAME PARSED: Given='{given_name}', Family='{family_name}'")
+                    logger.debug("INVENTOR NAME PARSED: Given='%s', Family='%s'", given_name, family_name)
                 else:
                     # Single name - treat as given name
-                    inventor_evidence.given_name_evidence = EvidenceItem(
+                    inventor_evidence.given_name_evidence = _make_evidence_item(
                         field_name="given_name",
                         raw_text=name_data,
-                        source_location=SourceLocation(
-                            page=inv_data.get("source", {}).get("page", 1),
-                            section=inv_data.get("source", {}).get("section", "inventor_info"),
-                            raw_text=name_data,
-                            extraction_method=extraction_method
-                        ),
-                        confidence=ConfidenceLevel("medium")
+                        page=src_page,
+                        section=src_section,
+                        confidence=ConfidenceLevel.MEDIUM,
+                        extraction_method=extraction_method
                     )
-                    logger.info(f"INVENTOR SINGLE NAME: {name_data}")
+                    logger.debug("INVENTOR SINGLE NAME: %s", name_data)
         
         # Fallback: Check for separate given_name and family_name fields (legacy format)
         elif "given_name" in inv_data and inv_data["given_name"]:
@@ -421,25 +949,22 @@ class EnhancedExtractionService:
                 if isinstance(given_name_data, dict) and "text" in given_name_data:
                     raw_text = given_name_data["text"]
                     page = given_name_data.get("source_page", 1)
-                    section = given_name_data.get("source_section", "inventor_info")
+                    section = given_name_data.get("source_section", INVENTOR_INFO_SECTION)
                     confidence = given_name_data.get("confidence", "medium")
                 else:
                     raw_text = str(given_name_data)
                     page = 1
-                    section = "inventor_info"
+                    section = INVENTOR_INFO_SECTION
                     confidence = "medium"
-                logger.info(f"INVENTOR GIVEN NAME (legacy): {raw_text}")
+                logger.debug("INVENTOR GIVEN NAME (legacy): %s", raw_text)
             
-            inventor_evidence.given_name_evidence = EvidenceItem(
+            inventor_evidence.given_name_evidence = _make_evidence_item(
                 field_name="given_name",
                 raw_text=raw_text,
-                source_location=SourceLocation(
-                    page=page,
-                    section=section,
-                    raw_text=raw_text,
-                    extraction_method=extraction_method
-                ),
-                confidence=ConfidenceLevel(confidence)
+                page=page,
+                section=section,
+                confidence=_CONFIDENCE_LEVELS.get(confidence, ConfidenceLevel.MEDIUM),
+                extraction_method=extraction_method
             )
             
             # Parse family name evidence for legacy format
@@ -456,25 +981,22 @@ class EnhancedExtractionService:
                     if isinstance(family_name_data, dict) and "text" in family_name_data:
                         raw_text = family_name_data["text"]
                         page = family_name_data.get("source_page", 1)
-                        section = family_name_data.get("source_section", "inventor_info")
+                        section = family_name_data.get("source_section", INVENTOR_INFO_SECTION)
                         confidence = family_name_data.get("confidence", "medium")
                     else:
                         raw_text = str(family_name_data)
                         page = 1
-                        section = "inventor_info"
+                        section = INVENTOR_INFO_SECTION
                         confidence = "medium"
-                    logger.info(f"INVENTOR FAMILY NAME (legacy): {raw_text}")
+                    logger.debug("INVENTOR FAMILY NAME (legacy): %s", raw_text)
                 
-                inventor_evidence.family_name_evidence = EvidenceItem(
+                inventor_evidence.family_name_evidence = _make_evidence_item(
                     field_name="family_name",
                     raw_text=raw_text,
-                    source_location=SourceLocation(
-                        page=page,
-                        section=section,
-                        raw_text=raw_text,
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(confidence)
+                    page=page,
+                    section=section,
+                    confidence=_CONFIDENCE_LEVELS.get(confidence, ConfidenceLevel.MEDIUM),
+                    extraction_method=extraction_method
                 )
         
         # Parse address evidence - FIXED: Handle actual LLM response structure
@@ -482,34 +1004,23 @@ class EnhancedExtractionService:
         if "address" in inv_data and inv_data["address"]:
             address_text = inv_data["address"]
             if isinstance(address_text, str) and address_text.strip():
-                inventor_evidence.address_evidence.append(EvidenceItem(
+                inventor_evidence.address_evidence.append(_make_evidence_item(
                     field_name="address",
                     raw_text=address_text,
-                    source_location=SourceLocation(
-                        page=inv_data.get("source", {}).get("page", 1),
-                        section=inv_data.get("source", {}).get("section", "inventor_info"),
-                        raw_text=address_text,
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel("medium")
+                    page=src_page,
+                    section=src_section,
+                    confidence=ConfidenceLevel.MEDIUM,
+                    extraction_method=extraction_method
                 ))
-                logger.info(f"INVENTOR ADDRESS PARSED: {address_text}")
+                logger.debug("INVENTOR ADDRESS PARSED: %s", address_text)
         
         # Fallback: Check for legacy address_evidence format
         address_data = inv_data.get("address_evidence", [])
         for addr_item in address_data:
             if addr_item and addr_item.get("raw_text"):
-                inventor_evidence.address_evidence.append(EvidenceItem(
-                    field_name=addr_item.get("field_name", "address"),
-                    raw_text=addr_item["raw_text"],
-                    source_location=SourceLocation(
-                        page=addr_item.get("page", 1),
-                        section=addr_item.get("section"),
-                        raw_text=addr_item["raw_text"],
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(addr_item.get("confidence", "medium"))
-                ))
+                inventor_evidence.address_evidence.append(
+                    _evidence_item_from_dict(addr_item.get("field_name", "address"), addr_item, extraction_method)
+                )
         
         return inventor_evidence
     
@@ -522,10 +1033,15 @@ class EnhancedExtractionService:
         Parse individual applicant evidence
         """
         applicant_evidence = ApplicantEvidence(
-            completeness=DataCompleteness(app_data.get("completeness", "incomplete")),
-            overall_confidence=ConfidenceLevel(app_data.get("confidence", "medium"))
+            completeness=_COMPLETENESS_LEVELS.get(app_data.get("completeness"), DataCompleteness.INCOMPLETE),
+            overall_confidence=_CONFIDENCE_LEVELS.get(app_data.get("confidence"), ConfidenceLevel.MEDIUM)
         )
         
+        # Source location shared by all fields given directly on the applicant
+        src = app_data.get("source") or {}
+        src_page = src.get("page", 1)
+        src_section = src.get("section", APPLICANT_INFO_SECTION)
+        
         # Parse organization name evidence - FIXED: Handle both nested and direct formats
         if "organization_name" in app_data and app_data["organization_name"]:
             org_name_data = app_data["organization_name"]
@@ -541,25 +1057,22 @@ class EnhancedExtractionService:
                 page = org_name_data.get("source_page", 1)
                 section = org_name_data.get("source_section")
                 confidence = org_name_data.get("confidence", "medium")
-                logger.info(f"APPLICANT ORG NAME (direct): {raw_text}")
+                logger.debug("APPLICANT ORG NAME (direct): %s", raw_text)
             else:
                 # Direct string format
                 raw_text = str(org_name_data)
                 page = 1
-                section = "applicant_info"
+                section = APPLICANT_INFO_SECTION
                 confidence = "medium"
-                logger.info(f"APPLICANT ORG NAME (string): {raw_text}")
+                logger.debug("APPLICANT ORG NAME (string): %s", raw_text)
             
-            applicant_evidence.organization_name_evidence = EvidenceItem(
+            applicant_evidence.organization_name_evidence = _make_evidence_item(
                 field_name="organization_name",
                 raw_text=raw_text,
-                source_location=SourceLocation(
-                    page=page,
-                    section=section,
-                    raw_text=raw_text,
-                    extraction_method=extraction_method
-                ),
-                confidence=ConfidenceLevel(confidence)
+                page=page,
+                section=section,
+                confidence=_CONFIDENCE_LEVELS.get(confidence, ConfidenceLevel.MEDIUM),
+                extraction_method=extraction_method
             )
         
         # Parse address evidence - ENHANCED: Handle multiple address formats
@@ -569,93 +1082,56 @@ class EnhancedExtractionService:
         if "address" in app_data and app_data["address"]:
             address_text = app_data["address"]
             if isinstance(address_text, str) and address_text.strip():
-                applicant_evidence.address_evidence.append(EvidenceItem(
+                applicant_evidence.address_evidence.append(_make_evidence_item(
                     field_name="address",
                     raw_text=address_text,
-                    source_location=SourceLocation(
-                        page=app_data.get("source", {}).get("page", 1),
-                        section=app_data.get("source", {}).get("section", "applicant_info"),
-                        raw_text=address_text,
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel("medium")
+                    page=src_page,
+                    section=src_section,
+                    confidence=ConfidenceLevel.MEDIUM,
+                    extraction_method=extraction_method
                 ))
-                logger.info(f"APPLICANT ADDRESS PARSED: {address_text}")
+                logger.debug("APPLICANT ADDRESS PARSED: %s", address_text)
         
         # Parse structured address evidence
         for addr_item in address_data:
             if addr_item and addr_item.get("raw_text"):
-                applicant_evidence.address_evidence.append(EvidenceItem(
-                    field_name=addr_item.get("field_name", "address"),
-                    raw_text=addr_item["raw_text"],
-                    source_location=SourceLocation(
-                        page=addr_item.get("page", 1),
-                        section=addr_item.get("section"),
-                        raw_text=addr_item["raw_text"],
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(addr_item.get("confidence", "medium"))
-                ))
+                applicant_evidence.address_evidence.append(
+                    _evidence_item_from_dict(addr_item.get("field_name", "address"), addr_item, extraction_method)
+                )
         
         # Parse individual name evidence for individual applicants
-        if "individual_given_name" in app_data or "individual_family_name" in app_data:
-            if app_data.get("individual_given_name"):
-                given_name_data = app_data["individual_given_name"]
-                raw_text = str(given_name_data) if not isinstance(given_name_data, dict) else given_name_data.get("text", str(given_name_data))
-                
-                individual_name_evidence = EvidenceItem(
-                    field_name="individual_given_name",
+        for field_name in ("individual_given_name", "individual_family_name"):
+            name_data = app_data.get(field_name)
+            if name_data:
+                raw_text = _text_value(name_data)
+                applicant_evidence.individual_name_evidence.append(_make_evidence_item(
+                    field_name=field_name,
                     raw_text=raw_text,
-                    source_location=SourceLocation(
-                        page=app_data.get("source", {}).get("page", 1),
-                        section=app_data.get("source", {}).get("section", "applicant_info"),
-                        raw_text=raw_text,
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel("medium")
-                )
-                applicant_evidence.individual_name_evidence.append(individual_name_evidence)
-                logger.info(f"INDIVIDUAL APPLICANT GIVEN NAME: {raw_text}")
-            
-            if app_data.get("individual_family_name"):
-                family_name_data = app_data["individual_family_name"]
-                raw_text = str(family_name_data) if not isinstance(family_name_data, dict) else family_name_data.get("text", str(family_name_data))
-                
-                individual_name_evidence = EvidenceItem(
-                    field_name="individual_family_name",
-                    raw_text=raw_text,
-                    source_location=SourceLocation(
-                        page=app_data.get("source", {}).get("page", 1),
-                        section=app_data.get("source", {}).get("section", "applicant_info"),
-                        raw_text=raw_text,
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel("medium")
-                )
-                applicant_evidence.individual_name_evidence.append(individual_name_evidence)
-                logger.info(f"INDIVIDUAL APPLICANT FAMILY NAME: {raw_text}")
+                    page=src_page,
+                    section=src_section,
+                    confidence=ConfidenceLevel.MEDIUM,
+                    extraction_method=extraction_method
+                ))
+                logger.debug("INDIVIDUAL APPLICANT %s: %s", field_name, raw_text)
         
         # Parse contact evidence (customer numbers, emails, etc.)
         contact_fields = ["customer_number", "email_address", "phone_number"]
         for field in contact_fields:
             if field in app_data and app_data[field]:
                 contact_data = app_data[field]
-                raw_text = str(contact_data) if not isinstance(contact_data, dict) else contact_data.get("text", str(contact_data))
+                raw_text = _text_value(contact_data)
                 
                 if raw_text and raw_text.strip():
-                    contact_evidence = EvidenceItem(
+                    contact_evidence = _make_evidence_item(
                         field_name=field,
                         raw_text=raw_text,
-                        source_location=SourceLocation(
-                            page=app_data.get("source", {}).get("page", 1),
-                            section=app_data.get("source", {}).get("section", "applicant_info"),
-                            raw_text=raw_text,
-                            extraction_method=extraction_method
-                        ),
-                        confidence=ConfidenceLevel("medium")
+                        page=src_page,
+                        section=src_section,
+                        confidence=ConfidenceLevel.MEDIUM,
+                        extraction_method=extraction_method
                     )
                     applicant_evidence.contact_evidence.append(contact_evidence)
-                    logger.info(f"APPLICANT {field.upper()}: {raw_text}")
+                    logger.debug("APPLICANT %s: %s", field.upper(), raw_text)
         
         return applicant_evidence
     
@@ -670,87 +1146,45 @@ class EnhancedExtractionService:
         secondary_applicants = []
         
         try:
-            # Check for applicants in correspondence sections
-            correspondence_data = evidence_response.get("correspondence_evidence", [])
-            for corr_item in correspondence_data:
-                if corr_item and corr_item.get("raw_text"):
-                    # Look for company names in correspondence
-                    raw_text = corr_item["raw_text"]
-                    if self._contains_company_indicators(raw_text):
-                        applicant_evidence = ApplicantEvidence(
-                            completeness=DataCompleteness.PARTIAL_NAME,
-                            overall_confidence=ConfidenceLevel.LOW
-                        )
-                        
-                        # Extract potential company name
-                        company_name = self._extract_company_name_from_text(raw_text)
-                        if company_name:
-                            applicant_evidence.organization_name_evidence = EvidenceItem(
-                                field_name="organization_name",
-                                raw_text=company_name,
-                                source_location=SourceLocation(
-                                    page=corr_item.get("page", 1),
-                                    section="correspondence",
-                                    raw_text=raw_text,
-                                    extraction_method=extraction_method
-                                ),
-                                confidence=ConfidenceLevel.LOW
-                            )
-                            secondary_applicants.append(applicant_evidence)
-            
-            # Check for applicants in header/footer information
-            for section_name in ["header_evidence", "footer_evidence", "letterhead_evidence"]:
-                section_data = evidence_response.get(section_name, [])
-                for item in section_data:
-                    if item and item.get("raw_text"):
-                        raw_text = item["raw_text"]
-                        if self._contains_company_indicators(raw_text):
-                            company_name = self._extract_company_name_from_text(raw_text)
-                            if company_name:
-                                applicant_evidence = ApplicantEvidence(
-                                    completeness=DataCompleteness.PARTIAL_NAME,
-                                    overall_confidence=ConfidenceLevel.LOW
-                                )
-                                applicant_evidence.organization_name_evidence = EvidenceItem(
-                                    field_name="organization_name",
-                                    raw_text=company_name,
-                                    source_location=SourceLocation(
-                                        page=item.get("page", 1),
-                                        section=section_name.replace("_evidence", ""),
-                                        raw_text=raw_text,
-                                        extraction_method=extraction_method
-                                    ),
-                                    confidence=ConfidenceLevel.LOW
-                                )
-                                secondary_applicants.append(applicant_evidence)
+            # Scan correspondence, header, footer and letterhead items in one pass.
+            # The name pattern ends in a legal suffix, so a match implies company indicators.
+            section_items = itertools.chain.from_iterable(
+                ((section, item) for item in evidence_response.get(f"{section}_evidence", []))
+                for section in SECONDARY_APPLICANT_SECTIONS
+            )
+            for section, item in section_items:
+                if not item or not item.get("raw_text"):
+                    continue
+                raw_text = item["raw_text"]
+                company_name = self._extract_company_name_from_text(raw_text)
+                if company_name:
+                    applicant_evidence = ApplicantEvidence(
+                        completeness=DataCompleteness.PARTIAL_NAME,
+                        overall_confidence=ConfidenceLevel.LOW
+                    )
+                    applicant_evidence.organization_name_evidence = _make_evidence_item(
+                        field_name="organization_name",
+                        raw_text=company_name,
+                        page=item.get("page", 1),
+                        section=section,
+                        source_text=raw_text,
+                        confidence=ConfidenceLevel.LOW,
+                        extraction_method=extraction_method
+                    )
+                    secondary_applicants.append(applicant_evidence)
             
-            logger.info(f"SECONDARY APPLICANT SEARCH: Found {len(secondary_applicants)} additional applicant candidates")
+            logger.info("SECONDARY APPLICANT SEARCH: Found %d additional applicant candidates", len(secondary_applicants))
             
         except Exception as e:
-            logger.warning(f"Secondary applicant extraction failed: {e}")
+            logger.warning("Secondary applicant extraction failed: %s", e)
         
         return secondary_applicants
     
-    def _contains_company_indicators(self, text: str) -> bool:
-        """
-        Check if text contains company/organization indicators
-        """
-        company_suffixes = ["Inc.", "LLC", "Corp.", "Corporation", "Ltd.", "Co.", "Company", "LLP"]
-        company_keywords = ["Corporation", "Company", "Industries", "Technologies", "Systems", "Solutions"]
-        
-        text_upper = text.upper()
-        return any(suffix.upper() in text_upper for suffix in company_suffixes) or \
-               any(keyword.upper() in text_upper for keyword in company_keywords)
-    
     def _extract_company_name_from_text(self, text: str) -> Optional[str]:
         """
         Extract potential company name from text
         """
-        import re
-        
-        # Look for patterns like "Company Name Inc." or "Company Name Corporation"
-        company_pattern = r'([A-Z][a-zA-Z\s&]+(?:Inc\.|LLC|Corp\.|Corporation|Ltd\.|Co\.|Company|LLP))'
-        matches = re.findall(company_pattern, text)
+        matches = _COMPANY_NAME_RE.findall(text)
         
         if matches:
             # Return the longest match (most likely to be complete company name)
@@ -768,46 +1202,56 @@ class EnhancedExtractionService:
         if len(applicant_candidates) <= 1:
             return applicant_candidates
         
+        keys = [self._normalize_organization_name(candidate) for candidate in applicant_candidates]
+        
+        # Group distinct names transitively (e.g. "TechCorp", "Tech Corp Inc.");
+        # each group's root is its earliest name, so candidate order is preserved.
+        # A bare name never joins groups with different legal forms together.
+        names = list(dict.fromkeys(key for key in keys if key))
+        name_index = {name: index for index, name in enumerate(names)}
+        parent = list(range(len(names)))
+        group_suffix = [_split_legal_suffix(name)[1] for name in names]
+        for i, j in _similar_name_pairs(names):
+            root_i, root_j = _find_root(parent, i), _find_root(parent, j)
+            if root_i == root_j or not _legal_suffixes_compatible(group_suffix[root_i], group_suffix[root_j]):
+                continue
+            root, other = min(root_i, root_j), max(root_i, root_j)
+            parent[other] = root
+            group_suffix[root] = group_suffix[root] or group_suffix[other]
+        
         unique_applicants = []
+        applicants_by_root = {}
         
-        for candidate in applicant_candidates:
-            is_duplicate = False
-            
-            for existing in unique_applicants:
-                if self._are_applicants_similar(candidate, existing):
-                    # Merge information from duplicate into existing
-                    self._merge_applicant_evidence(existing, candidate)
-                    is_duplicate = True
-                    break
+        for candidate, key in zip(applicant_candidates, keys):
+            if not key:
+                unique_applicants.append(candidate)
+                continue
             
-            if not is_duplicate:
+            root = _find_root(parent, name_index[key])
+            existing = applicants_by_root.get(root)
+            if existing is not None:
+                # Merge information from duplicate into existing
+                self._merge_applicant_evidence(existing, candidate)
+            else:
+                applicants_by_root[root] = candidate
                 unique_applicants.append(candidate)
         
-        logger.info(f"DEDUPLICATION: Reduced {len(applicant_candidates)} candidates to {len(unique_applicants)} unique applicants")
+        logger.info("DEDUPLICATION: Reduced %d candidates to %d unique applicants", len(applicant_candidates), len(unique_applicants))
         return unique_applicants
     
-    def _are_applicants_similar(
-        self,
-        candidate1: ApplicantEvidence,
-        candidate2: ApplicantEvidence
-    ) -> bool:
+    def _normalize_organization_name(self, candidate: ApplicantEvidence) -> Optional[str]:
         """
-        Check if two applicant candidates are likely the same entity
+        Comparison key for an applicant's organization name: lowercased,
+        punctuation collapsed to single spaces and a trailing legal suffix in
+        its canonical form. None when there is no usable name.
         """
-        # Compare organization names if both have them
-        if (candidate1.organization_name_evidence and candidate2.organization_name_evidence):
-            name1 = candidate1.organization_name_evidence.raw_text.lower().strip()
-            name2 = candidate2.organization_name_evidence.raw_text.lower().strip()
-            
-            # Simple similarity check - can be enhanced with fuzzy matching
-            if name1 == name2:
-                return True
-            
-            # Check if one name is contained in the other (e.g., "TechCorp" vs "TechCorp Inc.")
-            if name1 in name2 or name2 in name1:
-                return True
-        
-        return False
+        if not candidate.organization_name_evidence:
+            return None
+        name = _NON_WORD_RE.sub(" ", candidate.organization_name_evidence.raw_text.lower()).strip()
+        if not name:
+            return None
+        core, suffix = _split_legal_suffix(name)
+        return f"{core} {suffix}" if suffix else core
     
     def _merge_applicant_evidence(
         self,
@@ -824,34 +1268,18 @@ class EnhancedExtractionService:
         primary.contact_evidence.extend(secondary.contact_evidence)
         
         # Update completeness if secondary has better completeness
-        # Note: DataCompleteness enum values need to be compared properly
-        completeness_order = {
-            DataCompleteness.INCOMPLETE: 0,
-            DataCompleteness.PARTIAL_ADDRESS: 1,
-            DataCompleteness.PARTIAL_NAME: 2,
-            DataCompleteness.NAME_ONLY: 3,
-            DataCompleteness.ADDRESS_ONLY: 4,
-            DataCompleteness.COMPLETE: 5
-        }
-        
-        if completeness_order.get(secondary.completeness, 0) > completeness_order.get(primary.completeness, 0):
+        if secondary.completeness.rank > primary.completeness.rank:
             primary.completeness = secondary.completeness
         
         # Update confidence if secondary has higher confidence
-        confidence_order = {
-            ConfidenceLevel.LOW: 0,
-            ConfidenceLevel.MEDIUM: 1,
-            ConfidenceLevel.HIGH: 2
-        }
-        
-        if confidence_order.get(secondary.overall_confidence, 0) > confidence_order.get(primary.overall_confidence, 0):
+        if secondary.overall_confidence.rank > primary.overall_confidence.rank:
             primary.overall_confidence = secondary.overall_confidence
         
         # If secondary has better organization name evidence, use it
         if (secondary.organization_name_evidence and
             (not primary.organization_name_evidence or
-             confidence_order.get(secondary.organization_name_evidence.confidence, 0) >
-             confidence_order.get(primary.organization_name_evidence.confidence, 0))):
+             secondary.organization_name_evidence.confidence.rank >
+             primary.organization_name_evidence.confidence.rank)):
             primary.organization_name_evidence = secondary.organization_name_evidence
     
     def _parse_additional_evidence(
@@ -863,152 +1291,26 @@ class EnhancedExtractionService:
         """
         Parse additional evidence fields (application number, dates, entity status, etc.)
         """
-        # Application number evidence - FIXED: Handle array, object, and evidence formats
-        app_num_data = None
-        if "application_number_evidence" in evidence_response:
-            app_num_data = evidence_response["application_number_evidence"]
-        elif "application_number" in evidence_response:
-            # Handle direct format from LLM
-            app_info = evidence_response["application_number"]
-            if isinstance(app_info, list) and len(app_info) > 0:
-                # Handle array format - take first element
-                first_app = app_info[0]
-                if isinstance(first_app, dict) and first_app.get("text"):
-                    app_num_data = {
-                        "raw_text": first_app["text"],
-                        "page": first_app.get("source_page", 1),
-                        "section": first_app.get("source_section"),
-                        "confidence": first_app.get("confidence", "medium")
-                    }
-                    logger.info(f"APPLICATION NUMBER FOUND (array): {first_app['text']}")
-            elif isinstance(app_info, dict):
-                # Handle both "text" and "raw_text" fields
-                text_value = app_info.get("text") or app_info.get("raw_text")
-                if text_value:
-                    app_num_data = {
-                        "raw_text": text_value,
-                        "page": app_info.get("source_page", 1),
-                        "section": app_info.get("source_section"),
-                        "confidence": app_info.get("confidence", "medium")
-                    }
-                    logger.info(f"APPLICATION NUMBER FOUND (dict): {text_value}")
-        
-        if app_num_data and app_num_data.get("raw_text"):
-            document_evidence.application_number_evidence = EvidenceItem(
-                field_name="application_number",
-                raw_text=app_num_data["raw_text"],
-                source_location=SourceLocation(
-                    page=app_num_data.get("page", 1),
-                    section=app_num_data.get("section"),
-                    raw_text=app_num_data["raw_text"],
-                    extraction_method=extraction_method
-                ),
-                confidence=ConfidenceLevel(app_num_data.get("confidence", "medium"))
-            )
-        
-        # Filing date evidence
-        if "filing_date_evidence" in evidence_response:
-            date_data = evidence_response["filing_date_evidence"]
-            if date_data and date_data.get("raw_text"):
-                document_evidence.filing_date_evidence = EvidenceItem(
-                    field_name="filing_date",
-                    raw_text=date_data["raw_text"],
-                    source_location=SourceLocation(
-                        page=date_data.get("page", 1),
-                        section=date_data.get("section"),
-                        raw_text=date_data["raw_text"],
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(date_data.get("confidence", "medium"))
+        # Single-value fields were normalized by _normalize_response
+        for field_name in ("application_number", "filing_date", "entity_status"):
+            evidence_data = evidence_response.get(f"{field_name}_evidence")
+            
+            if evidence_data:
+                setattr(
+                    document_evidence,
+                    f"{field_name}_evidence",
+                    _evidence_item_from_dict(field_name, evidence_data, extraction_method)
                 )
-        
-        # Entity status evidence - COMPREHENSIVE FIX: Handle all possible formats
-        entity_data = None
-        
-        # Check all possible field names for entity status
-        entity_fields = ["entity_status_evidence", "entity_status", "entity_status_information"]
-        
-        for field_name in entity_fields:
-            if field_name in evidence_response:
-                entity_info = evidence_response[field_name]
-                logger.info(f"ENTITY STATUS RAW DATA ({field_name}): {entity_info}")
-                
-                if entity_info and entity_info != "null" and entity_info is not None:
-                    if isinstance(entity_info, list) and len(entity_info) > 0:
-                        # Handle array format - take first element
-                        first_entity = entity_info[0]
-                        if isinstance(first_entity, dict):
-                            text_value = first_entity.get("text") or first_entity.get("raw_text") or first_entity.get("value")
-                            if text_value:
-                                entity_data = {
-                                    "raw_text": text_value,
-                                    "page": first_entity.get("source_page", 1),
-                                    "section": first_entity.get("source_section", "entity_status"),
-                                    "confidence": first_entity.get("confidence", "medium")
-                                }
-                                logger.info(f"ENTITY STATUS FOUND (array): {text_value}")
-                                break
-                        elif isinstance(first_entity, str):
-                            entity_data = {
-                                "raw_text": first_entity,
-                                "page": 1,
-                                "section": "entity_status",
-                                "confidence": "medium"
-                            }
-                            logger.info(f"ENTITY STATUS FOUND (array string): {first_entity}")
-                            break
-                    elif isinstance(entity_info, dict):
-                        text_value = entity_info.get("text") or entity_info.get("raw_text") or entity_info.get("value")
-                        if text_value:
-                            entity_data = {
-                                "raw_text": text_value,
-                                "page": entity_info.get("source_page", 1),
-                                "section": entity_info.get("source_section", "entity_status"),
-                                "confidence": entity_info.get("confidence", "medium")
-                            }
-                            logger.info(f"ENTITY STATUS FOUND (dict): {text_value}")
-                            break
-                    elif isinstance(entity_info, str):
-                        entity_data = {
-                            "raw_text": entity_info,
-                            "page": 1,
-                            "section": "entity_status",
-                            "confidence": "medium"
-                        }
-                        logger.info(f"ENTITY STATUS FOUND (string): {entity_info}")
-                        break
-        
-        if entity_data and entity_data.get("raw_text"):
-            document_evidence.entity_status_evidence = EvidenceItem(
-                field_name="entity_status",
-                raw_text=entity_data["raw_text"],
-                source_location=SourceLocation(
-                    page=entity_data.get("page", 1),
-                    section=entity_data.get("section"),
-                    raw_text=entity_data["raw_text"],
-                    extraction_method=extraction_method
-                ),
-                confidence=ConfidenceLevel(entity_data.get("confidence", "medium"))
-            )
-            logger.info(f"ENTITY STATUS EVIDENCE PARSED: {entity_data['raw_text']}")
-        else:
-            logger.warning("No entity_status_evidence in LLM response")
+                logger.info("%s EVIDENCE PARSED: %s", field_name.upper(), evidence_data["raw_text"])
+            elif field_name == "entity_status":
+                logger.warning("No entity_status_evidence in LLM response")
         
         # Correspondence evidence
-        correspondence_data = evidence_response.get("correspondence_evidence", [])
-        for corr_item in correspondence_data:
-            if corr_item and corr_item.get("raw_text"):
-                document_evidence.correspondence_evidence.append(EvidenceItem(
-                    field_name=corr_item.get("field_name", "correspondence"),
-                    raw_text=corr_item["raw_text"],
-                    source_location=SourceLocation(
-                        page=corr_item.get("page", 1),
-                        section=corr_item.get("section"),
-                        raw_text=corr_item["raw_text"],
-                        extraction_method=extraction_method
-                    ),
-                    confidence=ConfidenceLevel(corr_item.get("confidence", "medium"))
-                ))
+        document_evidence.correspondence_evidence.extend(
+            _evidence_item_from_dict(corr_item.get("field_name", "correspondence"), corr_item, extraction_method)
+            for corr_item in evidence_response.get("correspondence_evidence", [])
+            if corr_item and corr_item.get("raw_text")
+        )
     
     async def _generate_json_from_evidence(
         self,
@@ -1038,7 +1340,7 @@ class EnhancedExtractionService:
             return extraction_result
             
         except Exception as e:
-            logger.error(f"JSON generation from evidence failed: {e}")
+            logger.error("JSON generation from evidence failed: %s", e)
             raise DataProcessingError(f"Failed to generate JSON from evidence: {str(e)}")
     
     async def _convert_to_extraction_result(
@@ -1081,44 +1383,17 @@ class EnhancedExtractionService:
         )
         
         # Convert inventors
-        inventors_data = json_response.get("inventors", [])
-        for inv_data in inventors_data:
-            inventor = EnhancedInventor(
-                given_name=inv_data.get("given_name"),
-                middle_name=inv_data.get("middle_name"),
-                family_name=inv_data.get("family_name"),
-                full_name=inv_data.get("full_name"),
-                street_address=inv_data.get("street_address"),
-                city=inv_data.get("city"),
-                state=inv_data.get("state"),
-                postal_code=inv_data.get("postal_code"),
-                country=inv_data.get("country"),
-                citizenship=inv_data.get("citizenship"),
-                completeness=DataCompleteness(inv_data.get("completeness", "incomplete")),
-                confidence_score=float(inv_data.get("confidence_score") or 0.5)
-            )
-            result.inventors.append(inventor)
+        result.inventors.extend(
+            EnhancedInventor.model_validate(_result_values(inv_data, INVENTOR_RESULT_FIELDS))
+            for inv_data in json_response.get("inventors", [])
+        )
         
         # Convert applicants
-        applicants_data = json_response.get("applicants", [])
-        for app_data in applicants_data:
-            applicant = EnhancedApplicant(
-                is_assignee=bool(app_data.get("is_assignee", False)),
-                organization_name=app_data.get("organization_name"),
-                individual_given_name=app_data.get("individual_given_name"),
-                individual_family_name=app_data.get("individual_family_name"),
-                street_address=app_data.get("street_address"),
-                city=app_data.get("city"),
-                state=app_data.get("state"),
-                postal_code=app_data.get("postal_code"),
-                country=app_data.get("country"),
-                customer_number=app_data.get("customer_number"),
-                email_address=app_data.get("email_address"),
-                relationship_to_inventors=app_data.get("relationship_to_inventors", "separate_entity"),
-                completeness=DataCompleteness(app_data.get("completeness", "incomplete")),
-                confidence_score=float(app_data.get("confidence_score") or 0.5)
-            )
-            result.applicants.append(applicant)
+        for app_data in json_response.get("applicants", []):
+            values = _result_values(app_data, APPLICANT_RESULT_FIELDS)
+            values["is_assignee"] = bool(app_data.get("is_assignee", False))
+            values["relationship_to_inventors"] = app_data.get("relationship_to_inventors", "separate_entity")
+            result.applicants.append(EnhancedApplicant.model_validate(values))
         
         return result
     
@@ -1140,6 +1415,10 @@ class EvidenceGatheringPrompts:
     Prompts for evidence gathering phase
     """
     
+    def __init__(self):
+        # Assembled prompt per extraction method; every part is a static string
+        self._prompt_cache: Dict[ExtractionMethod, str] = {}
+    
     def get_evidence_prompt(
         self,
         extraction_method: ExtractionMethod,
@@ -1148,16 +1427,23 @@ class EvidenceGatheringPrompts:
         """
         Get appropriate evidence gathering prompt based on extraction method
         """
+        prompt = self._prompt_cache.get(extraction_method)
+        if prompt is not None:
+            return prompt
+        
         base_prompt = self._get_base_evidence_prompt()
         
         if extraction_method == ExtractionMethod.XFA_FORM:
-            return base_prompt + self._get_xfa_specific_instructions()
+            prompt = base_prompt + self._get_xfa_specific_instructions()
         elif extraction_method == ExtractionMethod.FORM_FIELDS:
-            return base_prompt + self._get_form_fields_instructions()
+            prompt = base_prompt + self._get_form_fields_instructions()
         elif extraction_method == ExtractionMethod.VISION_ANALYSIS:
-            return base_prompt + self._get_vision_analysis_instructions()
+            prompt = base_prompt + self._get_vision_analysis_instructions()
         else:
-            return base_prompt + self._get_text_extraction_instructions()
+            prompt = base_prompt + self._get_text_extraction_instructions()
+        
+        self._prompt_cache[extraction_method] = prompt
+        return prompt
     
     def _get_base_evidence_prompt(self) -> str:
         """
@@ -1349,18 +1635,15 @@ You are analyzing extracted text content from a document.
 """
 
 
-class JSONGenerationPrompts:
-    """
-    Prompts for JSON generation phase
-    """
-    
-    def create_json_generation_prompt(self, document_evidence: DocumentEvidence) -> str:
-        """
-        Create JSON generation prompt based on gathered evidence
-        """
-        evidence_summary = self._summarize_evidence(document_evidence)
-        
-        return f"""
+_SINGLE_APPLICANT_WARNING = (
+    "SINGLE APPLICANT: Only found 1 applicant. Check for additional applicants in:\n"
+    "  - Secondary sections (headers, correspondence)\n"
+    "  - Multiple company mentions\n"
+    "  - Assignment statements"
+)
+
+# Static text of the JSON generation prompt, around the evidence summary
+_JSON_PROMPT_PREFIX = """
 Based ONLY on the evidence gathered below, generate a single, valid JSON object with ALL applicants found.
 
 **CRITICAL MULTI-APPLICANT RULES:**
@@ -1391,13 +1674,15 @@ Before generating JSON, verify:
 - Parse addresses carefully to separate postal codes from other address components
 
 **EVIDENCE SUMMARY:**
-{evidence_summary}
+"""
+
+_JSON_PROMPT_SCHEMA_HEAD = """
 
 **STEP 2: JSON GENERATION WITH MULTI-APPLICANT FOCUS**
 
 Generate a JSON object with this structure:
 
-{{
+{
   "title": "String from evidence or null",
   "application_number": "String from evidence or null",
   "filing_date": "YYYY-MM-DD format or null",
@@ -1407,7 +1692,7 @@ Generate a JSON object with this structure:
   "customer_number": "String from evidence or null",
   "correspondence_email": "String from evidence or null",
   "inventors": [
-    {{
+    {
       "given_name": "String from evidence",
       "middle_name": "COMPLETE middle name from evidence - DO NOT TRUNCATE (e.g. Michael, Elizabeth)",
       "family_name": "String from evidence",
@@ -1420,30 +1705,15 @@ Generate a JSON object with this structure:
       "citizenship": "REQUIRED - String from evidence (e.g. United States, US)",
       "completeness": "complete|partial_name|partial_address|incomplete",
       "confidence_score": "0.0-1.0 (float)"
-    }}
+    }
   ],
   "applicants": [
-    {{
-      "applicant_sequence": 1,
-      "is_assignee": true/false,
-      "organization_name": "String from evidence or null",
-      "individual_given_name": "String from evidence or null",
-      "individual_family_name": "String from evidence or null",
-      "street_address": "String from evidence",
-      "city": "String from evidence",
-      "state": "String from evidence",
-      "postal_code": "String from evidence",
-      "country": "String from evidence",
-      "customer_number": "String from evidence or null",
-      "email_address": "String from evidence or null",
-      "relationship_to_inventors": "same_as_inventor|separate_entity|unclear",
-      "legal_entity_type": "corporation|llc|individual|partnership|other|null",
-      "completeness": "complete|partial_name|partial_address|incomplete",
-      "confidence_score": "0.0-1.0 (float)",
-      "evidence_sources": ["primary_section|secondary_section|contextual"]
-    }},
-    {{
-      "applicant_sequence": 2,
+"""
+
+# One applicant object of the schema, split around its sequence number
+_APPLICANT_SCHEMA_START = """    {
+      "applicant_sequence": """
+_APPLICANT_SCHEMA_FIELDS = """,
       "is_assignee": true/false,
       "organization_name": "String from evidence or null",
       "individual_given_name": "String from evidence or null",
@@ -1460,9 +1730,11 @@ Generate a JSON object with this structure:
       "completeness": "complete|partial_name|partial_address|incomplete",
       "confidence_score": "0.0-1.0 (float)",
       "evidence_sources": ["primary_section|secondary_section|contextual"]
-    }}
+    }"""
+
+_JSON_PROMPT_SUFFIX = """
   ]
-}}
+}
 
 **FINAL MULTI-APPLICANT VALIDATION:**
 After generating JSON, confirm:
@@ -1480,119 +1752,175 @@ If any validation fails:
 3. Clarify relationships using relationship analysis
 4. Enhance incomplete data using cross-referencing
 """
+
+# Applicant slots always shown in the schema, so the model is reminded that
+# documents commonly name more than one applicant
+MIN_APPLICANT_SCHEMA_SLOTS = 2
+
+
+@lru_cache(maxsize=16)
+def _build_applicant_schema(applicant_count: int) -> str:
+    """
+    Applicant array entries of the JSON schema, one per applicant found in
+    the evidence
+    """
+    return ",\n".join(
+        f"{_APPLICANT_SCHEMA_START}{sequence}{_APPLICANT_SCHEMA_FIELDS}"
+        for sequence in range(1, max(applicant_count, MIN_APPLICANT_SCHEMA_SLOTS) + 1)
+    )
+
+
+@lru_cache(maxsize=1)
+def extraction_prompt_fingerprint() -> str:
+    """
+    Short hash of the static prompt text for both extraction steps, so
+    results cached under one version of the prompts are not served after
+    they change
+    """
+    evidence_prompts = EvidenceGatheringPrompts()
+    parts = [evidence_prompts.get_evidence_prompt(method, "") for method in ExtractionMethod]
+    parts += [
+        _JSON_PROMPT_PREFIX,
+        _JSON_PROMPT_SCHEMA_HEAD,
+        _build_applicant_schema(MIN_APPLICANT_SCHEMA_SLOTS),
+        _JSON_PROMPT_SUFFIX
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class JSONGenerationPrompts:
+    """
+    Prompts for JSON generation phase
+    """
+    
+    def create_json_generation_prompt(self, document_evidence: DocumentEvidence) -> str:
+        """
+        Create JSON generation prompt based on gathered evidence
+        """
+        return "".join((
+            _JSON_PROMPT_PREFIX,
+            self._summarize_evidence(document_evidence),
+            _JSON_PROMPT_SCHEMA_HEAD,
+            _build_applicant_schema(len(document_evidence.applicant_evidence)),
+            _JSON_PROMPT_SUFFIX
+        ))
     
     def _summarize_evidence(self, document_evidence: DocumentEvidence) -> str:
         """
         Summarize gathered evidence for JSON generation prompt
         """
-        summary_parts = []
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_evidence_diagnostics(document_evidence)
+        
+        title_evidence = document_evidence.title_evidence
+        app_number_evidence = document_evidence.application_number_evidence
+        entity_status_evidence = document_evidence.entity_status_evidence
+        applicant_evidence = document_evidence.applicant_evidence
         
-        # DIAGNOSTIC LOGGING: Track evidence completeness
-        logger.info(f"EVIDENCE SUMMARY - Title: {'FOUND' if document_evidence.title_evidence else 'MISSING'}")
-        logger.info(f"EVIDENCE SUMMARY - App Number: {'FOUND' if document_evidence.application_number_evidence else 'MISSING'}")
-        logger.info(f"EVIDENCE SUMMARY - Entity Status: {'FOUND' if document_evidence.entity_status_evidence else 'MISSING'}")
-        logger.info(f"EVIDENCE SUMMARY - Inventors Found: {len(document_evidence.inventor_evidence)}")
-        logger.info(f"EVIDENCE SUMMARY - Applicants Found: {len(document_evidence.applicant_evidence)}")
+        summary_parts = []
         
         # Title evidence
-        if document_evidence.title_evidence:
-            summary_parts.append(f"TITLE: {document_evidence.title_evidence.raw_text}")
+        if title_evidence:
+            summary_parts.append(f"TITLE: {title_evidence.raw_text}")
         
         # Application number evidence
-        if document_evidence.application_number_evidence:
-            summary_parts.append(f"APPLICATION NUMBER: {document_evidence.application_number_evidence.raw_text}")
+        if app_number_evidence:
+            summary_parts.append(f"APPLICATION NUMBER: {app_number_evidence.raw_text}")
         
-        # Entity status evidence - ADD DIAGNOSTIC
-        if document_evidence.entity_status_evidence:
-            summary_parts.append(f"ENTITY STATUS: {document_evidence.entity_status_evidence.raw_text}")
-            logger.info(f"ENTITY STATUS FOUND: {document_evidence.entity_status_evidence.raw_text}")
+        # Entity status evidence
+        if entity_status_evidence:
+            summary_parts.append(f"ENTITY STATUS: {entity_status_evidence.raw_text}")
         else:
             logger.warning("ENTITY STATUS EVIDENCE MISSING")
         
-        # Inventor evidence - ADD POSTAL CODE DIAGNOSTIC
+        # Inventor evidence, noting inventors with no postal code in any address
+        inventors_missing_postal_code = []
         for i, inv_evidence in enumerate(document_evidence.inventor_evidence):
-            inv_summary = f"INVENTOR {i+1}:"
+            inv_parts = [f"INVENTOR {i+1}:"]
             if inv_evidence.given_name_evidence:
-                inv_summary += f" Given: {inv_evidence.given_name_evidence.raw_text}"
+                inv_parts.append(f" Given: {inv_evidence.given_name_evidence.raw_text}")
             if inv_evidence.family_name_evidence:
-                inv_summary += f" Family: {inv_evidence.family_name_evidence.raw_text}"
-            
-            # DIAGNOSTIC: Check for postal codes in address evidence
-            postal_code_found = False
+                inv_parts.append(f" Family: {inv_evidence.family_name_evidence.raw_text}")
             for addr in inv_evidence.address_evidence:
-                inv_summary += f" Address: {addr.raw_text}"
-                # Check if this address contains postal code patterns
-                if any(pattern in addr.raw_text for pattern in ['02115', '02138', '94103', '94301', r'\d{5}']):
-                    postal_code_found = True
-            
-            if not postal_code_found:
-                logger.warning(f"INVENTOR {i+1} MISSING POSTAL CODE in address evidence")
+                inv_parts.append(f" Address: {addr.raw_text}")
+            if not any(_POSTAL_CODE_RE.search(addr.raw_text) for addr in inv_evidence.address_evidence):
+                inventors_missing_postal_code.append(i + 1)
             
-            summary_parts.append(inv_summary)
+            summary_parts.append("".join(inv_parts))
         
-        # Applicant evidence - ENHANCED MULTI-APPLICANT DIAGNOSTIC
-        total_applicants = len(document_evidence.applicant_evidence)
-        logger.info(f"EVIDENCE SUMMARY - Total Applicants Found: {total_applicants}")
+        if inventors_missing_postal_code:
+            logger.warning(
+                "INVENTORS MISSING POSTAL CODE in address evidence: %s", inventors_missing_postal_code
+            )
         
-        for i, app_evidence in enumerate(document_evidence.applicant_evidence):
-            app_summary = f"APPLICANT {i+1}:"
+        # Applicant evidence
+        total_applicants = len(applicant_evidence)
+        
+        applicant_names = []
+        for number, app_evidence in enumerate(applicant_evidence, 1):
+            app_parts = [f"APPLICANT {number}:"]
             
             # Organization name
             if app_evidence.organization_name_evidence:
                 org_name = app_evidence.organization_name_evidence.raw_text
-                app_summary += f" Org: {org_name}"
-                logger.info(f"APPLICANT {i+1} ORG: {org_name}")
-                
-                # Check source section for diagnostic
-                source_section = app_evidence.organization_name_evidence.source_location.section
-                logger.info(f"APPLICANT {i+1} SOURCE: {source_section}")
+                app_parts.append(f" Org: {org_name}")
+                applicant_names.append(org_name)
             
             # Individual name (if applicable)
-            if app_evidence.individual_name_evidence:
-                for name_evidence in app_evidence.individual_name_evidence:
-                    app_summary += f" Individual: {name_evidence.raw_text}"
+            for name_evidence in app_evidence.individual_name_evidence:
+                app_parts.append(f" Individual: {name_evidence.raw_text}")
             
             # Address information
-            address_count = len(app_evidence.address_evidence)
-            if address_count > 0:
-                app_summary += f" Addresses: {address_count}"
-                for addr in app_evidence.address_evidence:
-                    logger.info(f"APPLICANT {i+1} ADDRESS: {addr.raw_text}")
+            if app_evidence.address_evidence:
+                app_parts.append(f" Addresses: {len(app_evidence.address_evidence)}")
             
             # Contact information
-            contact_count = len(app_evidence.contact_evidence)
-            if contact_count > 0:
-                app_summary += f" Contacts: {contact_count}"
+            if app_evidence.contact_evidence:
+                app_parts.append(f" Contacts: {len(app_evidence.contact_evidence)}")
             
             # Completeness and confidence
-            app_summary += f" Completeness: {app_evidence.completeness.value}"
-            app_summary += f" Confidence: {app_evidence.overall_confidence.value}"
+            app_parts.append(f" Completeness: {app_evidence.completeness.value}")
+            app_parts.append(f" Confidence: {app_evidence.overall_confidence.value}")
             
-            summary_parts.append(app_summary)
+            summary_parts.append("".join(app_parts))
         
         # ENHANCED DIAGNOSTIC: Multi-applicant detection analysis
         if total_applicants == 0:
             logger.error("CRITICAL: No applicants found! This should not happen.")
             summary_parts.append("⚠️ NO APPLICANTS DETECTED - REVIEW EVIDENCE GATHERING")
         elif total_applicants == 1:
-            logger.warning("SINGLE APPLICANT: Only found 1 applicant. Check for additional applicants in:")
-            logger.warning("  - Secondary sections (headers, correspondence)")
-            logger.warning("  - Multiple company mentions")
-            logger.warning("  - Assignment statements")
+            logger.warning(_SINGLE_APPLICANT_WARNING)
             summary_parts.append("⚠️ SINGLE APPLICANT DETECTED - VERIFY NO ADDITIONAL APPLICANTS EXIST")
         else:
-            logger.info(f"MULTI-APPLICANT SUCCESS: Found {total_applicants} applicants")
+            logger.info("MULTI-APPLICANT SUCCESS: Found %d applicants", total_applicants)
             summary_parts.append(f"✅ MULTI-APPLICANT DETECTION: {total_applicants} applicants found")
         
-        # Check for specific test case patterns
-        applicant_names = []
-        for app_evidence in document_evidence.applicant_evidence:
-            if app_evidence.organization_name_evidence:
-                applicant_names.append(app_evidence.organization_name_evidence.raw_text)
-        
-        # Log applicant names for diagnostic purposes
         if applicant_names:
-            logger.info(f"APPLICANT NAMES DETECTED: {', '.join(applicant_names)}")
             summary_parts.append(f"APPLICANT NAMES: {', '.join(applicant_names)}")
         
-        return "\n".join(summary_parts)
\ No newline at end of file
+        return "\n".join(summary_parts)
+    
+    def _log_evidence_diagnostics(self, document_evidence: DocumentEvidence):
+        """
+        Log what evidence was gathered, for troubleshooting extraction gaps
+        """
+        title_evidence = document_evidence.title_evidence
+        app_number_evidence = document_evidence.application_number_evidence
+        entity_status_evidence = document_evidence.entity_status_evidence
+        
+        logger.debug("EVIDENCE SUMMARY - Title: %s", "FOUND" if title_evidence else "MISSING")
+        logger.debug("EVIDENCE SUMMARY - App Number: %s", "FOUND" if app_number_evidence else "MISSING")
+        logger.debug("EVIDENCE SUMMARY - Entity Status: %s", "FOUND" if entity_status_evidence else "MISSING")
+        logger.debug("EVIDENCE SUMMARY - Inventors Found: %d", len(document_evidence.inventor_evidence))
+        logger.debug("EVIDENCE SUMMARY - Applicants Found: %d", len(document_evidence.applicant_evidence))
+        
+        if entity_status_evidence:
+            logger.debug("ENTITY STATUS FOUND: %s", entity_status_evidence.raw_text)
+        
+        for number, app_evidence in enumerate(document_evidence.applicant_evidence, 1):
+            org_evidence = app_evidence.organization_name_evidence
+            if org_evidence:
+                logger.debug("APPLICANT %d ORG: %s", number, org_evidence.raw_text)
+                logger.debug("APPLICANT %d SOURCE: %s", number, org_evidence.source_location.section)
+            for addr in app_evidence.address_evidence:
+                logger.debug("APPLICANT %d ADDRESS: %s", number, addr.raw_text)
\ No newline at end of file
@@ -3,20 +3,100 @@ Integration module for enhanced extraction system with existing LLM service.
 Provides backward compatibility while enabling enhanced features.
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, Callable, Awaitable, Dict, Any
+from collections import OrderedDict
+from functools import cached_property
+from typing import Optional, Callable, Awaitable, Dict, Any, List, Tuple, Union
 from datetime import datetime
 
+from pydantic import ValidationError
+
 from app.services.llm import LLMService
-from app.services.enhanced_extraction_service import EnhancedExtractionService
+from app.services.enhanced_extraction_service import (
+    EnhancedExtractionService, content_digest, extraction_prompt_fingerprint
+)
 from app.services.validation_service import ValidationService
 from app.models.enhanced_extraction import (
-    EnhancedExtractionResult, ExtractionMethod, ExtractionMetadata
+    EnhancedExtractionResult, EnhancedApplicant, ExtractionMethod, ExtractionMetadata
 )
-from app.models.patent_application import PatentApplicationMetadata
+from app.models.patent_application import PatentApplicationMetadata, Inventor, Applicant
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    # Quality reports are then encoded with the standard json module
+    orjson = None
+
+def _legacy_applicant_name(applicant: EnhancedApplicant) -> str:
+    """Organization name, else the individual's given and family names."""
+    if applicant.organization_name:
+        return applicant.organization_name
+    parts = (applicant.individual_given_name, applicant.individual_family_name)
+    return " ".join(filter(None, parts)).strip()
+
+
+def _convert_enhanced_to_legacy(enhanced_result: EnhancedExtractionResult) -> PatentApplicationMetadata:
+    """
+    Convert enhanced extraction result to legacy PatentApplicationMetadata format.
+    Now supports multiple applicants by converting all applicants to the new frontend format.
+    """
+    # Enhanced results are already validated and the legacy Inventor/Applicant
+    # models have no constraints, so they are built with model_construct;
+    # the outer PatentApplicationMetadata is still validated.
+    
+    # Convert inventors
+    legacy_inventors = [
+        Inventor.model_construct(
+            first_name=enhanced_inventor.given_name,
+            middle_name=enhanced_inventor.middle_name,
+            last_name=enhanced_inventor.family_name,
+            name=enhanced_inventor.full_name,
+            street_address=enhanced_inventor.street_address,
+            city=enhanced_inventor.city,
+            state=enhanced_inventor.state,
+            zip_code=enhanced_inventor.postal_code,
+            country=enhanced_inventor.country,
+            citizenship=enhanced_inventor.citizenship,
+            extraction_confidence=enhanced_inventor.confidence_score
+        )
+        for enhanced_inventor in enhanced_result.inventors
+    ]
+    
+    # Convert all applicants (not just the first one)
+    legacy_applicants = [
+        Applicant.model_construct(
+            name=_legacy_applicant_name(enhanced_applicant),
+            street_address=enhanced_applicant.street_address,
+            city=enhanced_applicant.city,
+            state=enhanced_applicant.state,
+            zip_code=enhanced_applicant.postal_code,
+            country=enhanced_applicant.country
+        )
+        for enhanced_applicant in enhanced_result.applicants
+    ]
+    
+    # Create legacy metadata with multiple applicants support
+    legacy_metadata = PatentApplicationMetadata(
+        title=enhanced_result.title,
+        application_number=enhanced_result.application_number,
+        filing_date=enhanced_result.filing_date,
+        entity_status=enhanced_result.entity_status,
+        inventors=legacy_inventors,
+        applicant=legacy_applicants[0] if legacy_applicants else None,  # Keep backward compatibility
+        applicants=legacy_applicants,  # New field for multiple applicants
+        total_drawing_sheets=enhanced_result.total_drawing_sheets,
+        extraction_confidence=enhanced_result.quality_metrics.overall_quality_score,
+        debug_reasoning=f"Enhanced extraction - Quality: {enhanced_result.quality_metrics.overall_quality_score:.2f}, Applicants: {len(legacy_applicants)}"
+    )
+    
+    return legacy_metadata
+
+
 class EnhancedLLMService(LLMService):
     """
     Enhanced LLM service that extends the existing LLMService with 
@@ -25,16 +105,70 @@ class EnhancedLLMService(LLMService):
     
     def __init__(self):
         super().__init__()
-        self.enhanced_extraction_service = EnhancedExtractionService(llm_service=self)
-        self.validation_service = ValidationService()
         self.use_enhanced_extraction = True  # Flag to enable/disable enhanced extraction
+        # Extraction results by (model, prompt fingerprint, document type, content hash), LRU ordered
+        self._extraction_cache: "OrderedDict[Tuple[str, str, str, str], Dict[str, Any]]" = OrderedDict()
+    
+    # The extraction and validation services are built on first use, so
+    # importing this module (which creates the shared instance) stays cheap
+    @cached_property
+    def enhanced_extraction_service(self) -> EnhancedExtractionService:
+        return EnhancedExtractionService(llm_service=self)
+    
+    @cached_property
+    def validation_service(self) -> ValidationService:
+        return ValidationService()
+    
+    async def _extraction_cache_key(
+        self,
+        file_path: str,
+        file_content: Optional[bytes],
+        document_type: str
+    ) -> Optional[Tuple[str, str, str, str]]:
+        try:
+            # Documents can be tens of MB; hash off the event loop
+            content_hash = await asyncio.to_thread(content_digest, file_path, file_content)
+        except OSError as e:
+            logger.debug("Could not hash %s for extraction cache: %s", file_path, e)
+            return None
+        # The prompt fingerprint covers the prompt text, so editing a prompt
+        # invalidates cached results. Changes to how evidence is summarized
+        # into the prompt are not covered; bump the model or document type
+        # key when making one.
+        return (settings.GEMINI_MODEL, extraction_prompt_fingerprint(), document_type, content_hash)
+    
+    def _get_cached_extraction(self, cache_key: Tuple[str, str, str, str]) -> Optional[EnhancedExtractionResult]:
+        entry = self._extraction_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        try:
+            result = EnhancedExtractionResult.model_validate(entry)
+        except ValidationError:
+            # Stored under an older schema; drop it and re-extract
+            del self._extraction_cache[cache_key]
+            return None
+        
+        self._extraction_cache.move_to_end(cache_key)
+        return result
+    
+    def _store_cached_extraction(
+        self,
+        cache_key: Tuple[str, str, str, str],
+        result: EnhancedExtractionResult
+    ):
+        self._extraction_cache[cache_key] = result.model_dump()
+        self._extraction_cache.move_to_end(cache_key)
+        if len(self._extraction_cache) > settings.EXTRACTION_CACHE_SIZE:
+            self._extraction_cache.popitem(last=False)
     
     async def analyze_cover_sheet_enhanced(
         self,
         file_path: str,
         file_content: Optional[bytes] = None,
         progress_callback: Optional[Callable[[int, str], Awaitable[None]]] = None,
-        use_validation: bool = True
+        use_validation: bool = True,
+        use_cache: bool = True
     ) -> EnhancedExtractionResult:
         """
         Enhanced cover sheet analysis using two-step extraction process.
@@ -44,6 +178,9 @@ class EnhancedLLMService(LLMService):
             file_content: Optional raw bytes of the document
             progress_callback: Optional progress callback function
             use_validation: Whether to perform validation (default: True)
+            use_cache: Whether a cached result for identical content may be
+                returned (default: True). With False the document is always
+                re-extracted and the fresh result replaces any cached one.
             
         Returns:
             EnhancedExtractionResult with comprehensive data and quality metrics
@@ -51,13 +188,27 @@ class EnhancedLLMService(LLMService):
         try:
             logger.info(f"Starting enhanced extraction for: {file_path}")
             
-            # Perform two-step extraction
-            result = await self.enhanced_extraction_service.extract_with_two_step_process(
-                file_path=file_path,
-                file_content=file_content,
-                document_type="patent_application",
-                progress_callback=progress_callback
-            )
+            document_type = "patent_application"
+            cache_key = None
+            if settings.EXTRACTION_CACHE_ENABLED:
+                cache_key = await self._extraction_cache_key(file_path, file_content, document_type)
+            result = self._get_cached_extraction(cache_key) if cache_key and use_cache else None
+            
+            cache_hit = result is not None
+            if cache_hit:
+                logger.info(f"Reusing cached extraction for identical content: {file_path}")
+            else:
+                # Perform two-step extraction
+                # Pass the digest on so the document is not hashed again
+                result = await self.enhanced_extraction_service.extract_with_two_step_process(
+                    file_path=file_path,
+                    file_content=file_content,
+                    document_type=document_type,
+                    progress_callback=progress_callback,
+                    content_hash=cache_key[3] if cache_key else None
+                )
+                if cache_key:
+                    self._store_cached_extraction(cache_key, result)
             
             # Perform validation if requested
             if use_validation:
@@ -66,6 +217,10 @@ class EnhancedLLMService(LLMService):
                 
                 result = await self.validation_service.validate_extraction_result(result)
             
+            if cache_hit and progress_callback:
+                # The two-step process reports completion itself; a cached result never ran it
+                await progress_callback(100, "Extraction completed successfully")
+            
             logger.info(f"Enhanced extraction completed. Quality score: {result.quality_metrics.overall_quality_score:.2f}")
             
             return result
@@ -74,6 +229,31 @@ class EnhancedLLMService(LLMService):
             logger.error(f"Enhanced extraction failed: {e}", exc_info=True)
             raise
     
+    async def analyze_many(
+        self,
+        file_paths: List[str],
+        use_validation: bool = True,
+        concurrency: Optional[int] = None
+    ) -> List[Union[EnhancedExtractionResult, Exception]]:
+        """
+        Run enhanced extraction over several documents concurrently.
+        
+        At most `concurrency` documents (default: settings.MAX_CONCURRENT_EXTRACTIONS)
+        are in flight at once. Results are returned in input order; a document
+        that fails yields its exception instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.MAX_CONCURRENT_EXTRACTIONS)
+        
+        async def analyze_one(file_path: str) -> EnhancedExtractionResult:
+            async with semaphore:
+                return await self.analyze_cover_sheet_enhanced(
+                    file_path, use_validation=use_validation
+                )
+        
+        return await asyncio.gather(
+            *[analyze_one(file_path) for file_path in file_paths], return_exceptions=True
+        )
+    
     async def analyze_cover_sheet(
         self,
         file_path: str,
@@ -105,57 +285,8 @@ class EnhancedLLMService(LLMService):
     def _convert_to_legacy_format(self, enhanced_result: EnhancedExtractionResult) -> PatentApplicationMetadata:
         """
         Convert enhanced extraction result to legacy PatentApplicationMetadata format.
-        Now supports multiple applicants by converting all applicants to the new frontend format.
         """
-        from app.models.patent_application import Inventor, Applicant
-        
-        # Convert inventors
-        legacy_inventors = []
-        for enhanced_inventor in enhanced_result.inventors:
-            legacy_inventor = Inventor(
-                first_name=enhanced_inventor.given_name,
-                middle_name=enhanced_inventor.middle_name,
-                last_name=enhanced_inventor.family_name,
-                name=enhanced_inventor.full_name,
-                street_address=enhanced_inventor.street_address,
-                city=enhanced_inventor.city,
-                state=enhanced_inventor.state,
-                zip_code=enhanced_inventor.postal_code,
-                country=enhanced_inventor.country,
-                citizenship=enhanced_inventor.citizenship,
-                extraction_confidence=enhanced_inventor.confidence_score
-            )
-            legacy_inventors.append(legacy_inventor)
-        
-        # Convert all applicants (not just the first one)
-        legacy_applicants = []
-        for enhanced_applicant in enhanced_result.applicants:
-            legacy_applicant = Applicant(
-                name=enhanced_applicant.organization_name or
-                     f"{enhanced_applicant.individual_given_name or ''} {enhanced_applicant.individual_family_name or ''}".strip(),
-                street_address=enhanced_applicant.street_address,
-                city=enhanced_applicant.city,
-                state=enhanced_applicant.state,
-                zip_code=enhanced_applicant.postal_code,
-                country=enhanced_applicant.country
-            )
-            legacy_applicants.append(legacy_applicant)
-        
-        # Create legacy metadata with multiple applicants support
-        legacy_metadata = PatentApplicationMetadata(
-            title=enhanced_result.title,
-            application_number=enhanced_result.application_number,
-            filing_date=enhanced_result.filing_date,
-            entity_status=enhanced_result.entity_status,
-            inventors=legacy_inventors,
-            applicant=legacy_applicants[0] if legacy_applicants else None,  # Keep backward compatibility
-            applicants=legacy_applicants,  # New field for multiple applicants
-            total_drawing_sheets=enhanced_result.total_drawing_sheets,
-            extraction_confidence=enhanced_result.quality_metrics.overall_quality_score,
-            debug_reasoning=f"Enhanced extraction - Quality: {enhanced_result.quality_metrics.overall_quality_score:.2f}, Applicants: {len(legacy_applicants)}"
-        )
-        
-        return legacy_metadata
+        return _convert_enhanced_to_legacy(enhanced_result)
     
     async def get_extraction_quality_report(
         self,
@@ -195,6 +326,19 @@ class EnhancedLLMService(LLMService):
                 "manual_review_required": True
             }
     
+    async def get_extraction_quality_report_json(
+        self,
+        file_path: str,
+        file_content: Optional[bytes] = None
+    ) -> bytes:
+        """
+        Quality report encoded as JSON bytes, ready to use as a response body.
+        """
+        report = await self.get_extraction_quality_report(file_path, file_content)
+        if orjson is not None:
+            return orjson.dumps(report)
+        return json.dumps(report).encode("utf-8")
+    
     def enable_enhanced_extraction(self, enabled: bool = True):
         """Enable or disable enhanced extraction."""
         self.use_enhanced_extraction = enabled
@@ -202,11 +346,13 @@ class EnhancedLLMService(LLMService):
     
     def get_extraction_statistics(self) -> Dict[str, Any]:
         """Get statistics about extraction performance."""
-        # This could be expanded to track statistics over time
+        # This could be expanded to track statistics over time. The services
+        # are cached_property values, so check whether they have been built
+        # without triggering the getters.
         return {
             "enhanced_extraction_enabled": self.use_enhanced_extraction,
-            "extraction_service_available": self.enhanced_extraction_service is not None,
-            "validation_service_available": self.validation_service is not None
+            "extraction_service_available": "enhanced_extraction_service" in self.__dict__,
+            "validation_service_available": "validation_service" in self.__dict__
         }
 
 
@@ -218,8 +364,7 @@ class ExtractionResultConverter:
     @staticmethod
     def enhanced_to_legacy(enhanced_result: EnhancedExtractionResult) -> PatentApplicationMetadata:
         """Convert enhanced result to legacy format."""
-        service = EnhancedLLMService()
-        return service._convert_to_legacy_format(enhanced_result)
+        return _convert_enhanced_to_legacy(enhanced_result)
     
     @staticmethod
     def legacy_to_enhanced(legacy_result: PatentApplicationMetadata) -> EnhancedExtractionResult:
@@ -230,9 +375,8 @@ class ExtractionResultConverter:
         )
         
         # Convert inventors
-        enhanced_inventors = []
-        for legacy_inventor in legacy_result.inventors:
-            enhanced_inventor = EnhancedInventor(
+        enhanced_inventors = [
+            EnhancedInventor(
                 given_name=legacy_inventor.first_name,
                 middle_name=legacy_inventor.middle_name,
                 family_name=legacy_inventor.last_name,
@@ -249,7 +393,8 @@ class ExtractionResultConverter:
                 ]) else DataCompleteness.INCOMPLETE,
                 confidence_score=legacy_inventor.extraction_confidence or 0.5
             )
-            enhanced_inventors.append(enhanced_inventor)
+            for legacy_inventor in legacy_result.inventors
+        ]
         
         # Convert applicant
         enhanced_applicants = []
@@ -4,7 +4,8 @@ Entity separation validator to prevent applicant/inventor cross-contamination
 
 import re
 import logging
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from app.models.enhanced_extraction import (
     EnhancedInventor, EnhancedApplicant, ValidationResult, 
     CrossFieldValidationResult, DataCompleteness
@@ -12,6 +13,16 @@ from app.models.enhanced_extraction import (
 
 logger = logging.getLogger(__name__)
 
+# Per-entity validation results kept for reuse; the same inventors and
+# applicants recur across filings
+VALIDATION_CACHE_SIZE = 256
+
+
+def _indicator_pattern(indicators: List[str]) -> re.Pattern:
+    """Compile indicators into one case-insensitive alternation (plain substring match)"""
+    return re.compile("|".join(map(re.escape, indicators)), re.IGNORECASE)
+
+
 class EntitySeparationValidator:
     """Comprehensive validation to prevent inventor/applicant data confusion"""
     
@@ -32,9 +43,54 @@ class EntitySeparationValidator:
             r"^[A-Z][a-z]+ [A-Z]\. [A-Z][a-z]+$",  # First M. Last
             r"^[A-Z][a-z]+ [A-Z][a-z]+ [A-Z][a-z]+$"  # First Middle Last
         ]
+        
+        # One regex pass rules out values without any indicator before the
+        # per-indicator scan that reports which ones matched
+        self._corporate_re = _indicator_pattern(self.corporate_indicators)
+        self._business_address_re = _indicator_pattern(self.business_address_indicators)
+        self._individual_name_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.individual_name_patterns)
+        )
+        
+        # Results keyed by the exact field values each check reads, LRU ordered
+        self._validation_cache: "OrderedDict[Tuple, ValidationResult]" = OrderedDict()
+    
+    def _cached_validation(self, key: Tuple) -> Optional[ValidationResult]:
+        result = self._validation_cache.get(key)
+        if result is None:
+            return None
+        self._validation_cache.move_to_end(key)
+        # Callers may mutate the result, so hand out a copy
+        return result.model_copy(deep=True)
+    
+    def _store_validation(self, key: Tuple, result: ValidationResult) -> ValidationResult:
+        self._validation_cache[key] = result.model_copy(deep=True)
+        if len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+            self._validation_cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _find_indicators(pattern: re.Pattern, indicators: List[str], value: str) -> List[str]:
+        """Indicators occurring in value, in list order"""
+        if not pattern.search(value):
+            return []
+        value_lower = value.lower()
+        return [indicator for indicator in indicators if indicator in value_lower]
+    
+    def _corporate_indicators_in(self, value: str) -> List[str]:
+        return self._find_indicators(self._corporate_re, self.corporate_indicators, value)
+    
+    def _business_indicators_in(self, value: str) -> List[str]:
+        return self._find_indicators(self._business_address_re, self.business_address_indicators, value)
     
     def validate_inventor_purity(self, inventor: EnhancedInventor) -> ValidationResult:
         """Ensure inventor contains only individual person data"""
+        cache_key = ("inventor", inventor.given_name, inventor.family_name,
+                     inventor.full_name, inventor.street_address)
+        cached = self._cached_validation(cache_key)
+        if cached is not None:
+            return cached
+        
         errors = []
         warnings = []
         
@@ -47,40 +103,41 @@ class EntitySeparationValidator:
         
         for field_name, value in name_fields:
             if value:
-                for indicator in self.corporate_indicators:
-                    if indicator.lower() in value.lower():
-                        errors.append(
-                            f"Corporate indicator '{indicator}' found in inventor {field_name}: '{value}'"
-                        )
+                for indicator in self._corporate_indicators_in(value):
+                    errors.append(
+                        f"Corporate indicator '{indicator}' found in inventor {field_name}: '{value}'"
+                    )
         
         # Check for business address indicators
         if inventor.street_address:
-            for indicator in self.business_address_indicators:
-                if indicator.lower() in inventor.street_address.lower():
-                    warnings.append(
-                        f"Business address indicator '{indicator}' in inventor address: '{inventor.street_address}'"
-                    )
+            for indicator in self._business_indicators_in(inventor.street_address):
+                warnings.append(
+                    f"Business address indicator '{indicator}' in inventor address: '{inventor.street_address}'"
+                )
         
         # Validate name patterns (should look like individual names)
         if inventor.full_name:
-            is_individual_pattern = any(
-                re.match(pattern, inventor.full_name.strip()) 
-                for pattern in self.individual_name_patterns
-            )
-            if not is_individual_pattern:
+            if not self._individual_name_re.match(inventor.full_name.strip()):
                 warnings.append(
                     f"Inventor full_name doesn't match individual name patterns: '{inventor.full_name}'"
                 )
         
-        return ValidationResult(
+        return self._store_validation(cache_key, ValidationResult(
             is_valid=len(errors) == 0,
             errors=errors,
             warnings=warnings,
             confidence_score=1.0 - (len(errors) * 0.5) - (len(warnings) * 0.1)
-        )
+        ))
     
     def validate_applicant_completeness(self, applicant: EnhancedApplicant) -> ValidationResult:
         """Ensure applicant data is complete and properly structured"""
+        cache_key = ("applicant", applicant.organization_name, applicant.individual_given_name,
+                     applicant.individual_family_name, applicant.street_address,
+                     applicant.city, applicant.state, applicant.country)
+        cached = self._cached_validation(cache_key)
+        if cached is not None:
+            return cached
+        
         errors = []
         warnings = []
         
@@ -117,21 +174,18 @@ class EntitySeparationValidator:
         
         # Validate business address format
         if applicant.street_address:
-            has_business_indicators = any(
-                indicator.lower() in applicant.street_address.lower()
-                for indicator in self.business_address_indicators
-            )
+            has_business_indicators = bool(self._business_address_re.search(applicant.street_address))
             if not has_business_indicators and applicant.organization_name:
                 warnings.append(
                     "Corporate applicant address may not be a business address"
                 )
         
-        return ValidationResult(
+        return self._store_validation(cache_key, ValidationResult(
             is_valid=len(errors) == 0,
             errors=errors,
             warnings=warnings,
             confidence_score=1.0 - (len(errors) * 0.5) - (len(warnings) * 0.1)
-        )
+        ))
     
     def detect_cross_contamination(
         self, 
@@ -141,26 +195,28 @@ class EntitySeparationValidator:
         """Detect if applicant data has been assigned to inventors or vice versa"""
         issues = []
         recommendations = []
+        # Inventors whose given_name carries a corporate indicator, collected
+        # in the scan below so the no-applicant check needs no second pass
+        potential_applicant_inventors = []
         
         # Check if any inventor data looks like applicant data
         for i, inventor in enumerate(inventors):
             # Check for corporate names in inventor fields
             if inventor.given_name:
-                for indicator in self.corporate_indicators:
-                    if indicator.lower() in inventor.given_name.lower():
-                        issues.append(
-                            f"Inventor {i} given_name contains corporate indicator: '{inventor.given_name}'"
-                        )
-                        recommendations.append(
-                            f"Move corporate name from inventor {i} to applicant organization_name"
-                        )
+                corporate_found = self._corporate_indicators_in(inventor.given_name)
+                if corporate_found:
+                    potential_applicant_inventors.append(i)
+                for indicator in corporate_found:
+                    issues.append(
+                        f"Inventor {i} given_name contains corporate indicator: '{inventor.given_name}'"
+                    )
+                    recommendations.append(
+                        f"Move corporate name from inventor {i} to applicant organization_name"
+                    )
             
             # Check for business addresses in inventor fields
             if inventor.street_address:
-                business_score = sum(
-                    1 for indicator in self.business_address_indicators
-                    if indicator.lower() in inventor.street_address.lower()
-                )
+                business_score = len(self._business_indicators_in(inventor.street_address))
                 if business_score >= 2:  # Multiple business indicators
                     issues.append(
                         f"Inventor {i} address appears to be business address: '{inventor.street_address}'"
@@ -172,16 +228,6 @@ class EntitySeparationValidator:
         # Check if applicant data is missing when it should be present
         if not applicants and inventors:
             # Look for signs that inventors might actually be applicants
-            potential_applicant_inventors = []
-            for i, inventor in enumerate(inventors):
-                if inventor.given_name:
-                    corporate_score = sum(
-                        1 for indicator in self.corporate_indicators
-                        if indicator.lower() in inventor.given_name.lower()
-                    )
-                    if corporate_score > 0:
-                        potential_applicant_inventors.append(i)
-            
             if potential_applicant_inventors:
                 issues.append(
                     f"No applicants found, but inventors {potential_applicant_inventors} contain corporate indicators"
@@ -210,29 +256,28 @@ class EntitySeparationValidator:
         inventors_to_remove = []
         applicants_to_add = []
         
-        # Check inventors for corporate data
+        # Check inventors for corporate data. Only a corporate name triggers a
+        # fix, so look for that directly; the lookup stops at the first name
+        # field carrying an indicator and skips inventors with no names.
         for i, inventor in enumerate(inventors):
-            corporate_issues = self._detect_corporate_data_in_inventor(inventor)
-            
-            if corporate_issues['has_corporate_name']:
-                # Extract corporate name and create applicant
-                org_name = self._extract_corporate_name(inventor)
-                if org_name:
-                    new_applicant = EnhancedApplicant(
-                        organization_name=org_name,
-                        street_address=inventor.street_address,
-                        city=inventor.city,
-                        state=inventor.state,
-                        postal_code=inventor.postal_code,
-                        country=inventor.country,
-                        completeness=DataCompleteness.PARTIAL_NAME,
-                        confidence_score=0.7  # Lower confidence due to correction
-                    )
-                    applicants_to_add.append(new_applicant)
-                    inventors_to_remove.append(i)
-                    fixes_applied.append(
-                        f"Moved corporate name '{org_name}' from inventor {i} to new applicant"
-                    )
+            org_name = self._extract_corporate_name(inventor)
+            if org_name:
+                # Create applicant from the corporate name
+                new_applicant = EnhancedApplicant(
+                    organization_name=org_name,
+                    street_address=inventor.street_address,
+                    city=inventor.city,
+                    state=inventor.state,
+                    postal_code=inventor.postal_code,
+                    country=inventor.country,
+                    completeness=DataCompleteness.PARTIAL_NAME,
+                    confidence_score=0.7  # Lower confidence due to correction
+                )
+                applicants_to_add.append(new_applicant)
+                inventors_to_remove.append(i)
+                fixes_applied.append(
+                    f"Moved corporate name '{org_name}' from inventor {i} to new applicant"
+                )
         
         return {
             'fixes_applied': fixes_applied,
@@ -240,34 +285,6 @@ class EntitySeparationValidator:
             'applicants_to_add': applicants_to_add
         }
     
-    def _detect_corporate_data_in_inventor(self, inventor: EnhancedInventor) -> Dict[str, bool]:
-        """Detect if inventor contains corporate data"""
-        
-        issues = {
-            'has_corporate_name': False,
-            'has_business_address': False,
-            'corporate_indicators_found': [],
-            'business_indicators_found': []
-        }
-        
-        # Check name fields for corporate indicators
-        name_fields = [inventor.given_name, inventor.family_name, inventor.full_name]
-        for name_field in name_fields:
-            if name_field:
-                for indicator in self.corporate_indicators:
-                    if indicator.lower() in name_field.lower():
-                        issues['has_corporate_name'] = True
-                        issues['corporate_indicators_found'].append(indicator)
-        
-        # Check address for business indicators
-        if inventor.street_address:
-            for indicator in self.business_address_indicators:
-                if indicator.lower() in inventor.street_address.lower():
-                    issues['has_business_address'] = True
-                    issues['business_indicators_found'].append(indicator)
-        
-        return issues
-    
     def _extract_corporate_name(self, inventor: EnhancedInventor) -> Optional[str]:
         """Extract corporate name from inventor data"""
         
@@ -279,9 +296,7 @@ class EntitySeparationValidator:
         ]
         
         for name in name_candidates:
-            if name:
-                for indicator in self.corporate_indicators:
-                    if indicator.lower() in name.lower():
-                        return name.strip()
+            if name and self._corporate_re.search(name):
+                return name.strip()
         
         return None
\ No newline at end of file
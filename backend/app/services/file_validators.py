@@ -8,13 +8,26 @@ Handles edge cases for PDF and DOCX file uploads:
 Drop this module into: app/services/file_validators.py
 """
 
+import hashlib
 import io
 import logging
+import os
 import re
+import zipfile
+from collections import OrderedDict
 from typing import Optional
 
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
 logger = logging.getLogger(__name__)
 
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    # Text assessment then uses pypdf only
+    fitz = None
+
 
 # ============================================================================
 # MAGIC BYTES — File Format Validation
@@ -35,7 +48,20 @@ MAGIC_BYTES = {
     },
 }
 
-ALLOWED_EXTENSIONS = {"pdf", "docx"}
+# (signature, offset, file type) triples for _detect_file_type
+_SIGNATURES = tuple(
+    (info["signature"], info["offset"], ftype) for ftype, info in MAGIC_BYTES.items()
+)
+
+ALLOWED_EXTENSIONS = frozenset({"pdf", "docx"})
+
+ALLOWED_MIME_TYPES = frozenset({
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    # Some browsers send generic MIME for docx
+    "application/octet-stream",
+    "application/zip",
+})
 
 
 class FileValidationError(Exception):
@@ -47,6 +73,13 @@ class FileValidationError(Exception):
         super().__init__(message)
 
 
+# Memoize validate_file_integrity on (content digest, filename) so retries and
+# duplicate uploads of the same bytes skip re-parsing. Off unless enabled.
+VALIDATION_CACHE_ENABLED = os.getenv("FILE_VALIDATION_CACHE", "false").lower() == "true"
+VALIDATION_CACHE_SIZE = 128
+_validation_cache: "OrderedDict[tuple, dict | FileValidationError]" = OrderedDict()
+
+
 # ============================================================================
 # P0: Core Validation Functions
 # ============================================================================
@@ -71,6 +104,30 @@ def validate_file_integrity(
     Raises:
         FileValidationError if file is fundamentally invalid.
     """
+    if not VALIDATION_CACHE_ENABLED:
+        return _validate_file_integrity(file_content, filename)
+
+    key = (hashlib.blake2b(file_content, digest_size=16).digest(), filename)
+    cached = _validation_cache.get(key)
+    if cached is None:
+        try:
+            cached = _validate_file_integrity(file_content, filename)
+        except FileValidationError as e:
+            cached = e
+        _validation_cache[key] = cached
+        if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    else:
+        _validation_cache.move_to_end(key)
+
+    if isinstance(cached, FileValidationError):
+        raise FileValidationError(cached.message, error_code=cached.error_code)
+    # Callers may mutate the result, so hand out a copy
+    return {**cached, "warnings": list(cached["warnings"])}
+
+
+def _validate_file_integrity(file_content: bytes, filename: str) -> dict:
+    """Uncached body of validate_file_integrity."""
     result = {
         "valid": True,
         "file_type": None,
@@ -127,19 +184,20 @@ def validate_file_integrity(
 
 def _detect_file_type(content: bytes) -> Optional[str]:
     """Detect file type from magic bytes."""
-    for ftype, info in MAGIC_BYTES.items():
-        offset = info["offset"]
-        sig = info["signature"]
-        if content[offset : offset + len(sig)] == sig:
+    for sig, offset, ftype in _SIGNATURES:
+        if content.startswith(sig, offset):
             return ftype
     return None
 
 
 def _get_extension(filename: str) -> Optional[str]:
     """Extract lowercase extension from filename."""
-    if not filename or "." not in filename:
+    if not filename:
+        return None
+    dot = filename.rfind(".")
+    if dot < 0:
         return None
-    ext = filename.rsplit(".", 1)[-1].lower()
+    ext = filename[dot + 1:].lower()
     return ext if ext in ALLOWED_EXTENSIONS else None
 
 
@@ -150,9 +208,6 @@ def _get_extension(filename: str) -> Optional[str]:
 
 def _validate_pdf(content: bytes, result: dict) -> None:
     """Run PDF-specific checks: encryption, corruption, blank pages."""
-    from pypdf import PdfReader
-    from pypdf.errors import PdfReadError
-
     try:
         reader = PdfReader(io.BytesIO(content))
     except PdfReadError as e:
@@ -210,15 +265,17 @@ def _validate_pdf(content: bytes, result: dict) -> None:
         )
 
     # Check for blank content (all pages have no extractable text)
-    total_text = ""
+    total_chars = 0
     for page in reader.pages:
+        if not _page_may_have_text(page):
+            continue
         text = page.extract_text() or ""
-        total_text += text.strip()
+        total_chars += len(text.strip())
         # Short-circuit: if we find substantial text, no need to check all pages
-        if len(total_text) > 50:
+        if total_chars > 50:
             break
 
-    if len(total_text) < 10:
+    if total_chars < 10:
         # This is a WARNING, not an error — the PDF might be scanned/image-only
         # and the vision fallback path can handle it
         result["warnings"].append(
@@ -235,9 +292,6 @@ def validate_pdf_not_encrypted(content: bytes) -> tuple[bool, str]:
     Returns (is_ok, error_message).
     Use this if you want a quick check without full validation.
     """
-    from pypdf import PdfReader
-    from pypdf.errors import PdfReadError
-
     try:
         reader = PdfReader(io.BytesIO(content))
         if reader.is_encrypted:
@@ -261,10 +315,11 @@ def validate_pdf_not_encrypted(content: bytes) -> tuple[bool, str]:
 # ============================================================================
 
 
+_DOCX_READ_CHUNK_SIZE = 64 * 1024
+
+
 def _validate_docx(content: bytes, result: dict) -> None:
     """Run DOCX-specific checks: valid ZIP, contains document.xml, not empty."""
-    import zipfile
-
     try:
         with zipfile.ZipFile(io.BytesIO(content)) as zf:
             names = zf.namelist()
@@ -278,10 +333,15 @@ def _validate_docx(content: bytes, result: dict) -> None:
                     error_code="DOCX_INVALID_STRUCTURE",
                 )
 
-            # Try to read document.xml to verify it's not corrupted
+            # Stream document.xml through to verify it's not corrupted (the
+            # CRC is checked at the end) without holding it in memory; its
+            # size comes from the central directory
             try:
-                doc_xml = zf.read("word/document.xml")
-                if len(doc_xml) < 50:
+                info = zf.getinfo("word/document.xml")
+                with zf.open(info) as doc_xml:
+                    while doc_xml.read(_DOCX_READ_CHUNK_SIZE):
+                        pass
+                if info.file_size < 50:
                     result["warnings"].append("DOCX document.xml is unusually small.")
             except Exception:
                 raise FileValidationError(
@@ -313,17 +373,19 @@ def _validate_docx(content: bytes, result: dict) -> None:
 def truncate_pdf_pages(
     content: bytes,
     max_pages: int = 10,
+    reader=None,
 ) -> tuple[bytes, int, bool]:
     """
     If a PDF exceeds max_pages, return a truncated version.
     This prevents sending 50+ page specifications to the LLM.
 
+    Pass an already-open PdfReader for `content` as `reader` to skip re-parsing.
+
     Returns:
         (truncated_content, original_page_count, was_truncated)
     """
-    from pypdf import PdfReader, PdfWriter
-
-    reader = PdfReader(io.BytesIO(content))
+    if reader is None:
+        reader = PdfReader(io.BytesIO(content))
     total_pages = len(reader.pages)
 
     if total_pages <= max_pages:
@@ -347,32 +409,125 @@ def truncate_pdf_pages(
 # ============================================================================
 
 
-def assess_pdf_text_content(content: bytes) -> dict:
+def _page_may_have_text(page) -> bool:
     """
-    Analyze how much extractable text a PDF contains.
-    Helps decide whether to use text extraction or vision/OCR fallback.
+    Cheap pre-check before page.extract_text().
 
-    Returns:
-        dict with:
-            - total_chars (int): total extracted character count
-            - has_text (bool): whether meaningful text was found
-            - is_likely_scanned (bool): probably a scanned document
-            - text_per_page (float): average chars per page
-            - recommendation (str): "text", "vision", or "ocr"
+    Text is only drawn inside BT ... ET blocks of the page content or of a
+    Form XObject it paints, so a page with neither (e.g. a bare scanned
+    image) has no extractable text. Returns True whenever unsure.
+    """
+    try:
+        contents = page.get("/Contents")
+        if contents is not None:
+            contents = contents.get_object()
+            streams = contents if isinstance(contents, list) else [contents]
+            if any(b"BT" in stream.get_object().get_data() for stream in streams):
+                return True
+
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources is not None else None
+        if xobjects is not None:
+            return any(
+                xobject.get_object().get("/Subtype") == "/Form"
+                for xobject in xobjects.get_object().values()
+            )
+    except Exception:
+        return True
+    return False
+
+
+def _text_verdict_chars(num_pages: int) -> int:
     """
-    from pypdf import PdfReader
+    Character count past which assess_pdf_text_content recommends "text"
+    whatever the remaining pages contain, so page scanning can stop.
+    """
+    return max(200, 100 * num_pages)
+
+
+def _count_pdf_text_fitz(content: bytes) -> Optional[tuple[int, int, int]]:
+    """
+    (total_chars, pages_with_text, num_pages) using PyMuPDF, or None when
+    the document should go through pypdf instead. MuPDF silently repairs
+    damaged files and opens non-PDFs, so anything it did not read cleanly
+    as a PDF (or that is encrypted) is left to pypdf and its usual errors.
+    """
+    try:
+        doc = fitz.open(stream=content, filetype="pdf")
+    except Exception:
+        return None
+
+    with doc:
+        if not doc.is_pdf or doc.is_repaired or doc.needs_pass:
+            return None
 
-    reader = PdfReader(io.BytesIO(content))
+        total_chars = 0
+        pages_with_text = 0
+        num_pages = doc.page_count
+        text_verdict_chars = _text_verdict_chars(num_pages)
+
+        try:
+            for page in doc:
+                char_count = len(page.get_text("text").strip())
+                total_chars += char_count
+                if char_count > 20:  # More than trivial content
+                    pages_with_text += 1
+                if total_chars > text_verdict_chars:
+                    break
+        except Exception:
+            return None
+
+    return total_chars, pages_with_text, num_pages
+
+
+def _count_pdf_text_pypdf(content: bytes, reader=None) -> tuple[int, int, int]:
+    """(total_chars, pages_with_text, num_pages) using pypdf."""
+    if reader is None:
+        reader = PdfReader(io.BytesIO(content))
     total_chars = 0
     pages_with_text = 0
     num_pages = len(reader.pages)
+    text_verdict_chars = _text_verdict_chars(num_pages)
 
     for page in reader.pages:
+        if not _page_may_have_text(page):
+            continue
         text = (page.extract_text() or "").strip()
         char_count = len(text)
         total_chars += char_count
         if char_count > 20:  # More than trivial content
             pages_with_text += 1
+        if total_chars > text_verdict_chars:
+            break
+
+    return total_chars, pages_with_text, num_pages
+
+
+def assess_pdf_text_content(content: bytes, reader=None) -> dict:
+    """
+    Analyze how much extractable text a PDF contains.
+    Helps decide whether to use text extraction or vision/OCR fallback.
+    Pass an already-open PdfReader for `content` as `reader` to skip re-parsing.
+
+    Text is counted with PyMuPDF when it is installed and no reader is
+    given, otherwise with pypdf. Pages are scanned in order and scanning
+    stops as soon as the document is certain to be recommended "text"; the
+    character and page counts then cover only the pages read.
+
+    Returns:
+        dict with:
+            - total_chars (int): total extracted character count
+            - has_text (bool): whether meaningful text was found
+            - is_likely_scanned (bool): probably a scanned document
+            - text_per_page (float): average chars per page
+            - recommendation (str): "text", "vision", or "ocr"
+    """
+    counts = None
+    if reader is None and fitz is not None:
+        counts = _count_pdf_text_fitz(content)
+    if counts is None:
+        counts = _count_pdf_text_pypdf(content, reader)
+    total_chars, pages_with_text, num_pages = counts
 
     text_per_page = total_chars / max(num_pages, 1)
 
@@ -405,6 +560,18 @@ def assess_pdf_text_content(content: bytes) -> dict:
 # P1: XML-Safe Text Sanitization (Unicode & Special Characters)
 # ============================================================================
 
+# XML 1.0 allows: #x9 | #xA | #xD | [#x20-#xD7FF] | [#xE000-#xFFFD]
+_XML_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+
+# XML special characters and their entities. Order matters: & must be first
+_XML_ESCAPES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&apos;"),
+)
+
 
 def sanitize_for_xml(text: Optional[str]) -> str:
     """
@@ -421,24 +588,22 @@ def sanitize_for_xml(text: Optional[str]) -> str:
         return ""
 
     # Remove XML-illegal control characters (keep tab, newline, carriage return)
-    # XML 1.0 allows: #x9 | #xA | #xD | [#x20-#xD7FF] | [#xE000-#xFFFD]
-    cleaned = re.sub(
-        r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]",
-        "",
-        text,
-    )
+    cleaned = _XML_CONTROL_CHARS_RE.sub("", text)
 
-    # Escape XML special characters
-    # Order matters: & must be first
-    cleaned = cleaned.replace("&", "&amp;")
-    cleaned = cleaned.replace("<", "&lt;")
-    cleaned = cleaned.replace(">", "&gt;")
-    cleaned = cleaned.replace('"', "&quot;")
-    cleaned = cleaned.replace("'", "&apos;")
+    # Escape XML special characters; most values contain none of them, so
+    # only copy the string for characters that are actually present
+    for char, entity in _XML_ESCAPES:
+        if char in cleaned:
+            cleaned = cleaned.replace(char, entity)
 
     return cleaned
 
 
+_LEADING_NUMBERING_RE = re.compile(r"^[\d]+[.):\-]\s*")
+_BRACKETS_RE = re.compile(r"[\[\]{}()]")
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
+
 def sanitize_inventor_name(name: Optional[str]) -> str:
     """
     Normalize inventor/applicant names.
@@ -455,16 +620,16 @@ def sanitize_inventor_name(name: Optional[str]) -> str:
     name = name.strip()
 
     # Remove leading numbering artifacts ("1.", "1)", "#1")
-    name = re.sub(r"^[\d]+[.):\-]\s*", "", name)
+    name = _LEADING_NUMBERING_RE.sub("", name)
 
     # Remove surrounding quotes
     name = name.strip("\"'`""''")
 
     # Remove stray brackets
-    name = re.sub(r"[\[\]{}()]", "", name)
+    name = _BRACKETS_RE.sub("", name)
 
     # Collapse multiple spaces
-    name = re.sub(r"\s+", " ", name)
+    name = _WHITESPACE_RUN_RE.sub(" ", name)
 
     # Trim to reasonable length (USPTO name fields max ~50 chars)
     if len(name) > 60:
@@ -499,15 +664,7 @@ def validate_upload(
                 raise HTTPException(status_code=400, detail=e.message)
     """
     # Check MIME type first (fast, before reading content)
-    allowed_mimes = {
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        # Some browsers send generic MIME for docx
-        "application/octet-stream",
-        "application/zip",
-    }
-
-    if content_type and content_type not in allowed_mimes:
+    if content_type and content_type not in ALLOWED_MIME_TYPES:
         raise FileValidationError(
             f"Unsupported file type: {content_type}. "
             "Please upload a PDF or DOCX file.",
@@ -522,6 +679,13 @@ def validate_upload(
 # Convenience: Validate Before LLM Processing (in Celery worker)
 # ============================================================================
 
+# Upper bound on what validate_before_extraction will hand to a parser. Uploads
+# are capped at 50 MB; this only guards against junk reaching the worker.
+MAX_EXTRACTION_SIZE_MB = 80
+
+# PDF readers accept a header preceded by junk within the first 1024 bytes
+_PDF_HEADER_SEARCH_LIMIT = 1024
+
 
 def validate_before_extraction(
     file_content: bytes,
@@ -538,7 +702,30 @@ def validate_before_extraction(
         - page_count (int): original page count
         - was_truncated (bool)
         - warnings (list[str])
+
+    Raises:
+        FileValidationError if the content is not a file_type document or is
+        too large, checked before any parser is constructed.
     """
+    # Cheap gate before pypdf/zipfile see the bytes
+    size_mb = len(file_content) / (1024 * 1024)
+    if size_mb > MAX_EXTRACTION_SIZE_MB:
+        raise FileValidationError(
+            f"File is too large ({size_mb:.1f} MB). "
+            f"Maximum size for extraction is {MAX_EXTRACTION_SIZE_MB} MB.",
+            error_code="FILE_TOO_LARGE",
+        )
+    detected_type = _detect_file_type(file_content)
+    if detected_type is None and file_content.find(b"%PDF-", 0, _PDF_HEADER_SEARCH_LIMIT) != -1:
+        # Not every upload path checks magic bytes at offset 0
+        detected_type = "pdf"
+    if detected_type != file_type:
+        raise FileValidationError(
+            f"The file content does not match the expected {file_type.upper()} format "
+            f"(detected as {detected_type.upper() if detected_type else 'unknown'}).",
+            error_code="TYPE_MISMATCH",
+        )
+
     result = {
         "content": file_content,
         "extraction_strategy": "text",
@@ -552,8 +739,12 @@ def validate_before_extraction(
         return result
 
     if file_type == "pdf":
+        # Without PyMuPDF, parse once so assessment and truncation share the
+        # pypdf reader; with it, pypdf is only needed if truncating
+        reader = None if fitz is not None else PdfReader(io.BytesIO(file_content))
+
         # Assess text content to determine extraction strategy
-        assessment = assess_pdf_text_content(file_content)
+        assessment = assess_pdf_text_content(file_content, reader=reader)
         result["page_count"] = assessment["total_pages"]
         result["extraction_strategy"] = assessment["recommendation"]
 
@@ -566,7 +757,7 @@ def validate_before_extraction(
         # Truncate if too many pages
         if assessment["total_pages"] > max_pages:
             truncated, original_count, was_truncated = truncate_pdf_pages(
-                file_content, max_pages
+                file_content, max_pages, reader=reader
             )
             result["content"] = truncated
             result["was_truncated"] = was_truncated
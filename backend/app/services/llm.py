@@ -32,7 +32,16 @@ except ImportError:
 # TEXT CLEANING UTILITIES - Fix for Fragmented PDF Text Extraction
 # ══════════════════════════════════════════════════════════════════════════════
 
-def clean_fragmented_text(text: str) -> str:
+# Compiled once at import; clean_fragmented_text runs on every page of every document
+_BLANK_LINE_RE = re.compile(r'\n\s+\n')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+_MID_SENTENCE_NEWLINE_RE = re.compile(r'(?<![.!?:\]\)])\n(?=[a-z])')
+_MULTI_SPACE_RE = re.compile(r'  +')
+_SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([,.:;!?\)])')
+_SPACE_AFTER_PAREN_RE = re.compile(r'\(\s+')
+
+
+def clean_fragmented_text(text: str, max_chars: Optional[int] = None) -> str:
     """
     Fix PDFs with fragmented text where each word is on its own line.
     
@@ -45,6 +54,9 @@ def clean_fragmented_text(text: str) -> str:
     
     Args:
         text: Raw extracted text from PDF
+        max_chars: Optional output budget. When set, only as much of the input
+            as is needed to produce max_chars of cleaned text is processed,
+            and the result is capped at max_chars.
         
     Returns:
         Cleaned text with proper spacing
@@ -52,39 +64,56 @@ def clean_fragmented_text(text: str) -> str:
     if not text:
         return text
     
+    if max_chars is None or len(text) <= max_chars:
+        return _clean_fragmented_block(text)[:max_chars]
+    
+    # Cleaning only ever shrinks text, so grow the raw prefix until the cleaned
+    # output fills the budget instead of cleaning the whole document.
+    end = max_chars
+    while True:
+        cleaned = _clean_fragmented_block(text[:end])
+        if len(cleaned) >= max_chars or end >= len(text):
+            return cleaned[:max_chars]
+        end = min(len(text), end * 2)
+
+
+def _clean_fragmented_block(text: str) -> str:
+    """
+    Apply the fragmentation cleaning passes to a block of text.
+    """
     # Pattern 1: newline + space + newline (most common fragmentation)
     # "WORD\n \nWORD" -> "WORD WORD"
     text = text.replace('\n \n', ' ')
     
     # Pattern 2: newline + multiple spaces + newline
     # "WORD\n   \nWORD" -> "WORD WORD"
-    text = re.sub(r'\n\s+\n', ' ', text)
+    text = _BLANK_LINE_RE.sub(' ', text)
     
     # Pattern 3: Multiple consecutive newlines (preserve paragraph breaks as double newline)
     # "sentence.\n\n\n\nNew paragraph" -> "sentence.\n\nNew paragraph"
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
     
     # Pattern 4: Single newlines that break words mid-sentence
     # But preserve intentional line breaks (after periods, colons, etc.)
     # This is tricky - only collapse newlines NOT preceded by sentence-ending punctuation
     # "relates to VR\nperipherals" -> "relates to VR peripherals"
     # "Technical Field\n[0001]" -> keep as is (section break)
-    text = re.sub(r'(?<![.!?:\]\)])\n(?=[a-z])', ' ', text)
+    text = _MID_SENTENCE_NEWLINE_RE.sub(' ', text)
     
     # Pattern 5: Collapse multiple spaces into single space
-    text = re.sub(r'  +', ' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
     
     # Pattern 6: Fix spaces before punctuation
     # "VANCOUVER ( CA )" -> "VANCOUVER (CA)"
-    text = re.sub(r'\s+([,.:;!?\)])', r'\1', text)
-    text = re.sub(r'\(\s+', '(', text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+    text = _SPACE_AFTER_PAREN_RE.sub('(', text)
     
     # Pattern 7: Trim whitespace from each line
     lines = [line.strip() for line in text.split('\n')]
     text = '\n'.join(lines)
     
     # Pattern 8: Remove empty lines that aren't paragraph breaks
-    text = re.sub(r'\n\n\n+', '\n\n', text)
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
     
     return text.strip()
 
@@ -152,6 +152,119 @@ class TestEnhancedExtractionService:
         method = await extraction_service._determine_extraction_method("test.pdf", None)
         assert method == ExtractionMethod.VISION_ANALYSIS
     
+    @pytest.mark.asyncio
+    async def test_extraction_method_cached_by_content(self, extraction_service, mock_llm_service):
+        """Test that re-submitting identical bytes skips method detection"""
+        
+        mock_llm_service._extract_xfa_data.return_value = "<xml>XFA data</xml>"
+        
+        first = await extraction_service._determine_extraction_method("a.pdf", b"same bytes")
+        second = await extraction_service._determine_extraction_method("b.pdf", b"same bytes")
+        
+        assert first == second == ExtractionMethod.XFA_FORM
+        assert mock_llm_service._extract_xfa_data.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_extraction_method_cache_evicts_least_recently_used(self, extraction_service, mock_llm_service):
+        """Test that a cache hit keeps a decision from being evicted"""
+        
+        mock_llm_service._extract_xfa_data.return_value = "<xml>XFA data</xml>"
+        
+        with patch("app.services.enhanced_extraction_service.EXTRACTION_METHOD_CACHE_SIZE", 2):
+            for content in (b"first", b"second", b"first", b"third"):
+                await extraction_service._determine_extraction_method("a.pdf", content)
+            assert mock_llm_service._extract_xfa_data.call_count == 3
+            
+            # "second" was evicted, "first" was kept by its hit
+            await extraction_service._determine_extraction_method("a.pdf", b"first")
+            assert mock_llm_service._extract_xfa_data.call_count == 3
+            await extraction_service._determine_extraction_method("a.pdf", b"second")
+            assert mock_llm_service._extract_xfa_data.call_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_extraction_method_uses_given_content_hash(self, extraction_service, mock_llm_service):
+        """Test that a digest computed by the caller is reused instead of rehashing"""
+        from app.services.enhanced_extraction_service import content_digest
+        
+        mock_llm_service._extract_xfa_data.return_value = "<xml>XFA data</xml>"
+        digest = content_digest("a.pdf", b"same bytes")
+        
+        with patch("app.services.enhanced_extraction_service.content_digest") as rehash:
+            await extraction_service._determine_extraction_method("a.pdf", b"same bytes", digest)
+            assert not rehash.called
+        
+        # Hashing the bytes here yields the same key as the caller's digest
+        await extraction_service._determine_extraction_method("b.pdf", b"same bytes")
+        assert mock_llm_service._extract_xfa_data.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_oversized_document_gathered_in_chunks(self, extraction_service, mock_llm_service):
+        """Test that oversized text is split into chunks and the evidence merged"""
+        
+        mock_llm_service._extract_xfa_data.return_value = None
+        mock_llm_service._extract_text_locally.return_value = "\n\n".join(
+            f"--- PAGE {i} ---\n" + "Inventor details and claims text. " * 800 for i in range(1, 6)
+        )
+        mock_llm_service.generate_structured_content.return_value = {
+            "inventors_evidence": [
+                {"given_name": {"raw_text": "Jane"}, "family_name": {"raw_text": "Smith"}}
+            ],
+            "applicants_evidence": [
+                {"organization_name": {"raw_text": "TechCorp Inc", "confidence": "high"}}
+            ]
+        }
+        
+        document_evidence = await extraction_service._gather_evidence_systematic(
+            "test.pdf", None, "patent_application"
+        )
+        
+        assert mock_llm_service.generate_structured_content.call_count > 1
+        assert len(document_evidence.inventor_evidence) == 1
+        assert len(document_evidence.applicant_evidence) == 1
+    
+    @pytest.mark.asyncio
+    async def test_fragmented_document_sized_after_cleaning(self, extraction_service, mock_llm_service):
+        """Test that word-per-line text that cleans down under the limit uses a single prompt"""
+        
+        mock_llm_service._extract_xfa_data.return_value = None
+        # ~56K raw chars, ~40K once the "\n \n" separators are collapsed
+        mock_llm_service._extract_text_locally.return_value = "WORD\n \n" * 8000
+        mock_llm_service.generate_structured_content.return_value = {
+            "inventors_evidence": [
+                {"given_name": {"raw_text": "Jane"}, "family_name": {"raw_text": "Smith"}}
+            ]
+        }
+        
+        await extraction_service._gather_evidence_systematic("test.pdf", None, "patent_application")
+        
+        assert mock_llm_service.generate_structured_content.call_count == 1
+        prompt = mock_llm_service.generate_structured_content.call_args.kwargs["prompt"]
+        assert "WORD WORD" in prompt
+    
+    @pytest.mark.asyncio
+    async def test_pending_progress_updates_cancelled_on_failure(self, extraction_service, mock_llm_service):
+        """Test that a failed extraction leaves no progress update in flight"""
+        
+        delivered = []
+        
+        async def slow_progress(progress, message):
+            await asyncio.sleep(0.05)
+            delivered.append(progress)
+        
+        mock_llm_service._extract_xfa_data.return_value = None
+        mock_llm_service._extract_text_locally.return_value = "Sample patent document text " * 50
+        mock_llm_service.generate_structured_content.side_effect = Exception("LLM unavailable")
+        
+        with pytest.raises(Exception):
+            await extraction_service.extract_with_two_step_process(
+                file_path="test.pdf",
+                document_type="patent_application",
+                progress_callback=slow_progress
+            )
+        
+        await asyncio.sleep(0.1)
+        assert delivered == []
+    
     @pytest.mark.asyncio
     async def test_evidence_parsing(self, extraction_service):
         """Test evidence response parsing"""
@@ -185,6 +298,356 @@ class TestEnhancedExtractionService:
         assert document_evidence.inventor_evidence[0].family_name_evidence.raw_text == "Smith"
 
 
+    @pytest.mark.asyncio
+    async def test_loosely_typed_evidence_fields_coerced(self, extraction_service):
+        """Test that evidence built without validation still round-trips through model_validate"""
+        
+        evidence_response = {
+            "title_evidence": {"raw_text": 12345, "page": "2", "section": {"name": "header"}},
+            "inventors_evidence": [
+                {"given_name": {"raw_text": "Jane", "page": None, "section": 3}}
+            ]
+        }
+        
+        document_evidence = await extraction_service._parse_evidence_response(
+            evidence_response, ExtractionMethod.TEXT_EXTRACTION
+        )
+        
+        title = document_evidence.title_evidence
+        assert title.raw_text == "12345"
+        assert title.source_location.page == 2
+        assert isinstance(title.source_location.section, str)
+        DocumentEvidence.model_validate(document_evidence.model_dump())
+
+
+class TestApplicantDeduplication:
+    """Test which applicant organization names are merged as one entity"""
+    
+    @pytest.fixture
+    def extraction_service(self):
+        return EnhancedExtractionService(llm_service=Mock())
+    
+    @staticmethod
+    def _candidate(name: str) -> ApplicantEvidence:
+        return ApplicantEvidence(
+            organization_name_evidence=EvidenceItem(
+                field_name="organization_name",
+                raw_text=name,
+                source_location=SourceLocation(
+                    page=1, raw_text=name, extraction_method=ExtractionMethod.TEXT_EXTRACTION
+                ),
+                confidence=ConfidenceLevel.HIGH
+            ),
+            completeness=DataCompleteness.PARTIAL_NAME,
+            overall_confidence=ConfidenceLevel.HIGH
+        )
+    
+    def _deduplicated_names(self, extraction_service, names):
+        from app.services.enhanced_extraction_service import _cached_names_match
+        _cached_names_match.cache_clear()
+        unique = extraction_service._deduplicate_applicant_candidates(
+            [self._candidate(name) for name in names]
+        )
+        return [applicant.organization_name_evidence.raw_text for applicant in unique]
+    
+    @pytest.mark.parametrize("names", [
+        ["TechCorp Inc", "TechCorp, Inc.", "TECHCORP INCORPORATED"],
+        ["TechCorp", "TechCorp Inc."],
+        ["Acme Widgets LLC", "Acme Widgets"],
+    ])
+    def test_same_entity_merged(self, extraction_service, names):
+        assert self._deduplicated_names(extraction_service, names) == names[:1]
+    
+    def test_spacing_variants_merged(self, extraction_service):
+        names = ["Tech Corp Solutions Inc", "TechCorp Solutions Inc"]
+        assert self._deduplicated_names(extraction_service, names) == names[:1]
+    
+    @pytest.mark.parametrize("names", [
+        ["ABC Company", "ABC Corporation"],
+        ["Acme", "Acme Widgets"],
+        ["Acme Widgets Inc", "Acme Gadgets Inc"],
+    ])
+    def test_distinct_entities_kept(self, extraction_service, names):
+        assert self._deduplicated_names(extraction_service, names) == names
+    
+    def test_bare_name_does_not_join_different_legal_forms(self, extraction_service):
+        names = ["ABC Corp", "ABC", "ABC Co"]
+        assert self._deduplicated_names(extraction_service, names) == ["ABC Corp", "ABC Co"]
+    
+    def test_many_candidates_grouped_in_first_seen_order(self, extraction_service):
+        distinct = [
+            "Alpha Robotics Inc", "Beacon Medical LLC", "Cobalt Energy Corp", "Delta Optics Ltd",
+            "Evergreen Foods Inc", "Falcon Aerospace LLC", "Granite Software Corp", "Harbor Labs Ltd",
+            "Ivory Materials Inc", "Juniper Networks LLC", "Keystone Devices Corp", "Lumen Biotech Ltd"
+        ]
+        variants = [
+            "ALPHA ROBOTICS, INC.", "Beacon Medical, LLC", "Cobalt Energy Corporation",
+            "Delta Optic Ltd", "Evergreen Foods Incorporated", "FalconAerospace LLC"
+        ]
+        
+        assert self._deduplicated_names(extraction_service, distinct + variants + distinct) == distinct
+    
+    def test_similar_name_pairs(self):
+        from app.services.enhanced_extraction_service import _cached_names_match, _similar_name_pairs
+        _cached_names_match.cache_clear()
+        
+        names = ["techcorp inc", "acme co", "tech corp inc", "techcorp", "acme corp"]
+        
+        assert _similar_name_pairs(names) == [(0, 2), (0, 3), (2, 3)]
+        assert _similar_name_pairs(names[:1]) == []
+    
+    def test_fallback_without_rapidfuzz(self, extraction_service):
+        with patch("app.services.enhanced_extraction_service.fuzz", None):
+            assert self._deduplicated_names(
+                extraction_service, ["TechCorp Inc", "TechCorp, Inc.", "TechCorp"]
+            ) == ["TechCorp Inc"]
+            assert self._deduplicated_names(
+                extraction_service, ["Acme", "Acme Widgets", "ABC Co", "ABC Corp"]
+            ) == ["Acme", "Acme Widgets", "ABC Co", "ABC Corp"]
+            # Only exact names merge without rapidfuzz
+            assert self._deduplicated_names(
+                extraction_service, ["Tech Corp Solutions Inc", "TechCorp Solutions Inc"]
+            ) == ["Tech Corp Solutions Inc", "TechCorp Solutions Inc"]
+
+
+class TestResponseNormalization:
+    """Test folding loosely shaped top-level evidence into one shape"""
+    
+    def test_normalize_response_shapes(self):
+        from app.services.enhanced_extraction_service import _normalize_response
+        
+        response = {
+            "title_evidence": [{"raw_text": "Widget", "page": 2, "section": "header", "confidence": "high"}],
+            "application_number": {"text": "17/123,456", "source_page": 3, "source_section": "box"},
+            "filing_date_evidence": "null",
+            "entity_status": "Small Entity",
+            "inventors": [{"name": "Jane Smith"}]
+        }
+        
+        normalized = _normalize_response(response)
+        
+        assert normalized["title_evidence"] == {
+            "raw_text": "Widget", "page": 2, "section": "header", "confidence": "high"
+        }
+        assert normalized["application_number_evidence"] == {
+            "raw_text": "17/123,456", "page": 3, "section": "box", "confidence": "medium"
+        }
+        assert normalized["filing_date_evidence"] is None
+        assert normalized["entity_status_evidence"] == {
+            "raw_text": "Small Entity", "page": 1, "section": "entity_status", "confidence": "medium"
+        }
+        # Other keys pass through and the input is not modified
+        assert normalized["inventors"] is response["inventors"]
+        assert "title" not in response and response["filing_date_evidence"] == "null"
+    
+    def test_normalize_response_alias_priority(self):
+        from app.services.enhanced_extraction_service import _normalize_response
+        
+        normalized = _normalize_response({
+            "title_evidence": [],
+            "invention_title": "Fallback Title"
+        })
+        
+        assert normalized["title_evidence"]["raw_text"] == "Fallback Title"
+
+
+class TestEvidenceKeyMemory:
+    """Test that the key an evidence list was found under is tried first next time"""
+    
+    def test_find_evidence_list_prefers_last_matched_key(self):
+        from app.services.enhanced_extraction_service import INVENTOR_EVIDENCE_KEYS
+        
+        service = EnhancedExtractionService(llm_service=Mock())
+        
+        key, data = service._find_evidence_list(
+            {"inventors_evidence": [], "inventors": [{"name": "A"}]}, INVENTOR_EVIDENCE_KEYS, None
+        )
+        assert (key, data) == ("inventors", [{"name": "A"}])
+        
+        # The remembered key wins even though an earlier-priority key is present
+        key, data = service._find_evidence_list(
+            {"inventors_evidence": [{"name": "B"}], "inventors": [{"name": "C"}]},
+            INVENTOR_EVIDENCE_KEYS, "inventors"
+        )
+        assert (key, data) == ("inventors", [{"name": "C"}])
+        
+        # An empty remembered key falls back to the priority order
+        key, data = service._find_evidence_list(
+            {"inventors_evidence": [{"name": "D"}]}, INVENTOR_EVIDENCE_KEYS, "inventors"
+        )
+        assert (key, data) == ("inventors_evidence", [{"name": "D"}])
+        
+        assert service._find_evidence_list({}, INVENTOR_EVIDENCE_KEYS, "inventors") == (None, [])
+    
+    @pytest.mark.asyncio
+    async def test_parsing_remembers_evidence_keys(self):
+        service = EnhancedExtractionService(llm_service=Mock())
+        
+        await service._parse_evidence_response(
+            {"inventors": [{"name": "Jane Smith"}], "companies": [{"organization_name": "TechCorp Inc"}]},
+            ExtractionMethod.TEXT_EXTRACTION
+        )
+        
+        assert service._last_inventors_key == "inventors"
+        assert service._last_applicants_key == "companies"
+
+
+class TestApplicantSchema:
+    """Test the JSON schema example sized to the applicant evidence"""
+    
+    @pytest.mark.parametrize("applicant_count, slots", [(0, 2), (1, 2), (2, 2), (3, 3), (5, 5)])
+    def test_applicant_schema_sized_to_applicants(self, applicant_count, slots):
+        from app.services.enhanced_extraction_service import _build_applicant_schema
+        
+        schema = _build_applicant_schema(applicant_count)
+        
+        assert schema.count('"applicant_sequence"') == slots
+        assert f'"applicant_sequence": {slots},' in schema
+        assert not schema.rstrip().endswith(",")
+
+
+class TestPostalCodeDetection:
+    """Test postal code detection in inventor address evidence"""
+    
+    @pytest.mark.parametrize("address, has_postal_code", [
+        ("123 Main St, Boston, MA 02115", True),
+        ("1 Market St, San Francisco, CA 94103-1234", True),
+        ("10 Harley St, London W1G 9PR", True),
+        ("Westminster, London SW1A 1AA", True),
+        ("Suite 1234, Springfield", False),
+        ("123 Main St, Springfield, IL", False),
+    ])
+    def test_postal_code_pattern(self, address, has_postal_code):
+        from app.services.enhanced_extraction_service import _POSTAL_CODE_RE
+        
+        assert bool(_POSTAL_CODE_RE.search(address)) == has_postal_code
+    
+    def test_summary_warns_about_inventors_missing_postal_code(self, caplog):
+        from app.services.enhanced_extraction_service import JSONGenerationPrompts
+        
+        def inventor(address):
+            return InventorEvidence(
+                address_evidence=[EvidenceItem(
+                    field_name="address",
+                    raw_text=address,
+                    source_location=SourceLocation(
+                        page=1, raw_text=address, extraction_method=ExtractionMethod.TEXT_EXTRACTION
+                    ),
+                    confidence=ConfidenceLevel.MEDIUM
+                )],
+                completeness=DataCompleteness.COMPLETE,
+                overall_confidence=ConfidenceLevel.MEDIUM
+            )
+        
+        evidence = DocumentEvidence(
+            document_pages=1,
+            inventor_evidence=[inventor("Boston, MA 02115"), inventor("Springfield, IL")]
+        )
+        
+        with caplog.at_level("WARNING", logger="app.services.enhanced_extraction_service"):
+            JSONGenerationPrompts()._summarize_evidence(evidence)
+        
+        assert "INVENTORS MISSING POSTAL CODE in address evidence: [2]" in caplog.text
+        assert "ENTITY STATUS EVIDENCE MISSING" in caplog.text
+
+
+class TestCleaningBudget:
+    """Test cleaning only as much fragmented text as the caller will keep"""
+    
+    def test_clean_fragmented_text_budget(self):
+        from app.services.llm import clean_fragmented_text
+        
+        text = "".join(f"WORD{i}\n \nnext\nline.\n\n\n" for i in range(3000))
+        full = clean_fragmented_text(text)
+        
+        for max_chars in (100, 5000, 50000):
+            assert clean_fragmented_text(text, max_chars=max_chars) == full[:max_chars]
+        # A budget larger than the cleaned text returns all of it
+        assert clean_fragmented_text(text, max_chars=len(full) + 1) == full
+
+
+class TestEntitySeparationValidatorCache:
+    """Test reuse of per-entity validation results"""
+    
+    def test_inventor_results_reused_for_same_fields(self):
+        from app.services.entity_separation_validator import EntitySeparationValidator
+        
+        validator = EntitySeparationValidator()
+        first = validator.validate_inventor_purity(EnhancedInventor(
+            given_name="John", family_name="Doe", full_name="John Doe",
+            street_address="Suite 100", city="Boston",
+            completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+        ))
+        # Fields the check does not read (city, confidence) do not affect the key
+        same = validator.validate_inventor_purity(EnhancedInventor(
+            given_name="John", family_name="Doe", full_name="John Doe",
+            street_address="Suite 100", city="Cambridge",
+            completeness=DataCompleteness.PARTIAL_ADDRESS, confidence_score=0.5
+        ))
+        different = validator.validate_inventor_purity(EnhancedInventor(
+            given_name="John", family_name="Doe", full_name="John Doe",
+            street_address="12 Elm St",
+            completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+        ))
+        
+        assert len(validator._validation_cache) == 2
+        assert same == first
+        assert first.warnings and not different.warnings
+    
+    def test_cached_results_are_copies(self):
+        from app.services.entity_separation_validator import EntitySeparationValidator
+        
+        validator = EntitySeparationValidator()
+        inventor = EnhancedInventor(
+            given_name="John", family_name="Doe", full_name="John Doe",
+            street_address="Suite 100",
+            completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+        )
+        
+        first = validator.validate_inventor_purity(inventor)
+        expected_warnings = list(first.warnings)
+        first.warnings.append("added by caller")
+        first.is_valid = False
+        second = validator.validate_inventor_purity(inventor)
+        second.warnings.clear()
+        third = validator.validate_inventor_purity(inventor)
+        
+        assert second is not first and third is not second
+        assert third.warnings == expected_warnings
+        assert third.is_valid
+    
+    def test_applicant_results_keyed_on_address_fields(self):
+        from app.services.entity_separation_validator import EntitySeparationValidator
+        
+        validator = EntitySeparationValidator()
+        complete = validator.validate_applicant_completeness(EnhancedApplicant(
+            organization_name="TechCorp Inc", street_address="1 Tech Plaza",
+            city="Boston", state="MA", country="US",
+            completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+        ))
+        missing_country = validator.validate_applicant_completeness(EnhancedApplicant(
+            organization_name="TechCorp Inc", street_address="1 Tech Plaza",
+            city="Boston", state="MA",
+            completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+        ))
+        
+        assert complete.is_valid
+        assert not missing_country.is_valid
+    
+    def test_cache_is_bounded(self):
+        from app.services.entity_separation_validator import (
+            EntitySeparationValidator, VALIDATION_CACHE_SIZE
+        )
+        
+        validator = EntitySeparationValidator()
+        for i in range(VALIDATION_CACHE_SIZE + 10):
+            validator.validate_inventor_purity(EnhancedInventor(
+                given_name=f"Name{i}", completeness=DataCompleteness.NAME_ONLY, confidence_score=0.5
+            ))
+        
+        assert len(validator._validation_cache) == VALIDATION_CACHE_SIZE
+
+
 class TestValidationService:
     """Test the validation service"""
     
@@ -432,6 +895,213 @@ class TestValidationService:
         assert isinstance(validated_result.recommendations, list)
 
 
+class TestEnhancedLLMIntegration:
+    """Test the extraction result cache in the LLM integration layer"""
+    
+    @pytest.fixture
+    def cached_result(self):
+        return EnhancedExtractionResult(
+            title="Cached Patent",
+            inventors=[EnhancedInventor(
+                given_name="John", family_name="Doe",
+                completeness=DataCompleteness.NAME_ONLY, confidence_score=0.9
+            )],
+            quality_metrics=QualityMetrics(
+                completeness_score=0.5,
+                accuracy_score=0.5,
+                confidence_score=0.5,
+                consistency_score=0.5,
+                overall_quality_score=0.5,
+                required_fields_populated=1,
+                total_required_fields=2,
+                optional_fields_populated=0,
+                total_optional_fields=0,
+                validation_errors=0,
+                validation_warnings=0
+            ),
+            extraction_metadata=ExtractionMetadata(
+                extraction_method=ExtractionMethod.TEXT_EXTRACTION,
+                document_type="patent_application",
+                processing_time=1.0
+            )
+        )
+    
+    @pytest.fixture
+    def llm_service(self, cached_result):
+        from app.services.enhanced_llm_integration import EnhancedLLMService
+        
+        service = EnhancedLLMService()
+        service.enhanced_extraction_service = Mock()
+        service.enhanced_extraction_service.extract_with_two_step_process = AsyncMock(return_value=cached_result)
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_reports_completion(self, llm_service):
+        """Test that a cached result still reports 100% progress and skips extraction"""
+        
+        await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"same bytes", use_validation=False)
+        
+        progress = []
+        
+        async def record_progress(value, message):
+            progress.append(value)
+        
+        cached = await llm_service.analyze_cover_sheet_enhanced(
+            "b.pdf", b"same bytes", progress_callback=record_progress, use_validation=False
+        )
+        
+        assert cached.title == "Cached Patent"
+        assert llm_service.enhanced_extraction_service.extract_with_two_step_process.call_count == 1
+        assert progress == [100]
+    
+    @pytest.mark.asyncio
+    async def test_content_hashed_once(self, llm_service):
+        """Test that the cache digest is passed on to extraction instead of recomputed"""
+        from app.services.enhanced_extraction_service import content_digest
+        
+        await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"same bytes", use_validation=False)
+        
+        call = llm_service.enhanced_extraction_service.extract_with_two_step_process.call_args
+        assert call.kwargs["content_hash"] == content_digest("a.pdf", b"same bytes")
+    
+    @pytest.mark.asyncio
+    async def test_cache_bypass_refreshes_result(self, llm_service, cached_result):
+        """Test that use_cache=False re-extracts and replaces the cached result"""
+        extract = llm_service.enhanced_extraction_service.extract_with_two_step_process
+        
+        await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"same bytes", use_validation=False)
+        extract.return_value = cached_result.model_copy(update={"title": "Re-extracted Patent"})
+        
+        fresh = await llm_service.analyze_cover_sheet_enhanced(
+            "a.pdf", b"same bytes", use_validation=False, use_cache=False
+        )
+        cached = await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"same bytes", use_validation=False)
+        
+        assert extract.call_count == 2
+        assert fresh.title == cached.title == "Re-extracted Patent"
+    
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_setting(self, llm_service):
+        """Test that EXTRACTION_CACHE_ENABLED=False skips hashing and caching"""
+        
+        with patch("app.services.enhanced_llm_integration.settings.EXTRACTION_CACHE_ENABLED", False), \
+                patch("app.services.enhanced_llm_integration.content_digest") as content_digest:
+            for _ in range(2):
+                await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"same bytes", use_validation=False)
+        
+        assert llm_service.enhanced_extraction_service.extract_with_two_step_process.call_count == 2
+        assert not content_digest.called
+        assert not llm_service._extraction_cache
+    
+    @pytest.mark.asyncio
+    async def test_cache_capacity_from_settings(self, llm_service):
+        """Test that the least recently used result is evicted at EXTRACTION_CACHE_SIZE"""
+        
+        with patch("app.services.enhanced_llm_integration.settings.EXTRACTION_CACHE_SIZE", 2):
+            for content in (b"first", b"second", b"first", b"third"):
+                await llm_service.analyze_cover_sheet_enhanced("a.pdf", content, use_validation=False)
+            await llm_service.analyze_cover_sheet_enhanced("a.pdf", b"second", use_validation=False)
+        
+        # "first" was used more recently than "second", so "second" was evicted
+        assert llm_service.enhanced_extraction_service.extract_with_two_step_process.call_count == 4
+        assert len(llm_service._extraction_cache) == 2
+    
+    @pytest.mark.asyncio
+    async def test_analyze_many_bounds_concurrency(self, llm_service, cached_result):
+        """Test that batches run concurrently up to the limit, in input order, isolating failures"""
+        in_flight = 0
+        peak = 0
+        
+        async def analyze(file_path, use_validation=True):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if file_path == "bad.pdf":
+                raise ValueError("unreadable")
+            return cached_result.model_copy(update={"title": file_path})
+        
+        llm_service.analyze_cover_sheet_enhanced = analyze
+        paths = ["a.pdf", "b.pdf", "bad.pdf", "c.pdf", "d.pdf"]
+        
+        results = await llm_service.analyze_many(paths, concurrency=2)
+        
+        assert peak == 2
+        assert [r.title for r in results if not isinstance(r, Exception)] == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+        assert isinstance(results[2], ValueError)
+    
+    def test_statistics_do_not_build_services(self):
+        """Test that reporting statistics leaves the lazily built services unbuilt"""
+        from app.services.enhanced_llm_integration import EnhancedLLMService
+        
+        service = EnhancedLLMService()
+        
+        stats = service.get_extraction_statistics()
+        
+        assert stats["extraction_service_available"] is False
+        assert stats["validation_service_available"] is False
+        assert "enhanced_extraction_service" not in service.__dict__
+        assert "validation_service" not in service.__dict__
+        
+        service.validation_service
+        assert service.get_extraction_statistics()["validation_service_available"] is True
+
+
+class TestLegacyConversion:
+    """Test conversion of enhanced results to the legacy metadata format"""
+    
+    def test_enhanced_to_legacy(self):
+        from app.models.patent_application import Applicant, Inventor
+        from app.services.enhanced_llm_integration import ExtractionResultConverter
+        
+        result = EnhancedExtractionResult(
+            title="Widget",
+            inventors=[EnhancedInventor(
+                given_name="Jane", middle_name="Q", family_name="Smith", full_name="Jane Q Smith",
+                city="Boston", state="MA", postal_code="02115", country="US", citizenship="US",
+                completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+            )],
+            applicants=[
+                EnhancedApplicant(
+                    organization_name="TechCorp Inc", street_address="1 Tech Plaza", city="Boston",
+                    completeness=DataCompleteness.COMPLETE, confidence_score=0.9
+                ),
+                EnhancedApplicant(
+                    individual_given_name="John", individual_family_name="Doe",
+                    completeness=DataCompleteness.PARTIAL_NAME, confidence_score=0.6
+                )
+            ],
+            quality_metrics=QualityMetrics(
+                completeness_score=0.8, accuracy_score=0.8, confidence_score=0.8,
+                consistency_score=0.8, overall_quality_score=0.8,
+                required_fields_populated=2, total_required_fields=2,
+                optional_fields_populated=0, total_optional_fields=0,
+                validation_errors=0, validation_warnings=0
+            ),
+            extraction_metadata=ExtractionMetadata(
+                extraction_method=ExtractionMethod.TEXT_EXTRACTION,
+                document_type="patent_application",
+                processing_time=1.0
+            )
+        )
+        
+        legacy = ExtractionResultConverter.enhanced_to_legacy(result)
+        
+        inventor = legacy.inventors[0]
+        assert (inventor.first_name, inventor.middle_name, inventor.last_name) == ("Jane", "Q", "Smith")
+        assert (inventor.zip_code, inventor.citizenship, inventor.extraction_confidence) == ("02115", "US", 0.9)
+        assert [applicant.name for applicant in legacy.applicants] == ["TechCorp Inc", "John Doe"]
+        assert legacy.applicant.street_address == "1 Tech Plaza"
+        assert legacy.extraction_confidence == 0.8
+        
+        # Constructed without validation, but identical to validated models, defaults included
+        for constructed, model in [(inventor, Inventor)] + [(a, Applicant) for a in legacy.applicants]:
+            assert constructed == model.model_validate(constructed.model_dump())
+        assert legacy.applicants[1].authority == "assignee"
+        assert legacy.model_dump()["inventors"][0]["residence_country"] is None
+
+
 class TestQualityMetrics:
     """Test quality metrics calculation"""
     
@@ -0,0 +1,266 @@
+"""
+Tests for upload and pre-extraction file validation.
+"""
+
+import io
+import zipfile
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from reportlab.pdfgen import canvas
+
+from app.services import file_validators
+from app.services.file_validators import (
+    FileValidationError,
+    _count_pdf_text_fitz,
+    _count_pdf_text_pypdf,
+    _page_may_have_text,
+    assess_pdf_text_content,
+    validate_before_extraction,
+    validate_file_integrity,
+)
+
+
+def make_pdf(page_texts):
+    """Build a PDF with one page per entry, each drawing the given text (or nothing)."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for text in page_texts:
+        if text:
+            pdf.drawString(72, 720, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def make_blank_pdf(num_pages):
+    """Build a PDF whose pages have no content stream, like a bare scan."""
+    writer = PdfWriter()
+    for _ in range(num_pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def make_docx(document_xml="<w:document/>"):
+    """Build a minimal DOCX container with an uncompressed document.xml."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as docx:
+        docx.writestr("[Content_Types].xml", "<Types/>")
+        if document_xml is not None:
+            docx.writestr("word/document.xml", document_xml)
+    return buffer.getvalue()
+
+
+class TestValidationCache:
+    """Test reuse of validate_file_integrity results for repeated uploads"""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        monkeypatch.setattr(file_validators, "VALIDATION_CACHE_ENABLED", True)
+        file_validators._validation_cache.clear()
+        yield
+        file_validators._validation_cache.clear()
+
+    def test_repeated_upload_validated_once(self, monkeypatch):
+        content = make_pdf(["Inventor: Jane Smith " * 10])
+        calls = []
+        original = file_validators._validate_file_integrity
+
+        def counting(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(file_validators, "_validate_file_integrity", counting)
+
+        first = validate_file_integrity(content, "app.pdf")
+        first["warnings"].append("mutated by caller")
+        second = validate_file_integrity(content, "app.pdf")
+        validate_file_integrity(content, "renamed.pdf")
+
+        assert len(calls) == 2
+        assert second["valid"] and second["file_type"] == "pdf"
+        assert "mutated by caller" not in second["warnings"]
+
+    def test_cached_failure_raised_again(self):
+        for _ in range(2):
+            with pytest.raises(FileValidationError) as exc_info:
+                validate_file_integrity(b"not a document", "app.pdf")
+            assert exc_info.value.error_code
+
+        assert len(file_validators._validation_cache) == 1
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(file_validators, "VALIDATION_CACHE_SIZE", 2)
+        content = make_pdf(["Inventor: Jane Smith " * 10])
+
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            validate_file_integrity(content, name)
+
+        assert [key[1] for key in file_validators._validation_cache] == ["b.pdf", "c.pdf"]
+
+
+class TestDocxValidation:
+    """Test the DOCX structure checks run on upload"""
+
+    def test_document_streamed_not_read_whole(self, monkeypatch):
+        body = "<w:p><w:r><w:t>Inventor: Jane Smith</w:t></w:r></w:p>" * 20000
+        content = make_docx(f"<w:document><w:body>{body}</w:body></w:document>")
+
+        def read_whole(*args, **kwargs):
+            raise AssertionError("document.xml should be streamed")
+
+        monkeypatch.setattr(zipfile.ZipFile, "read", read_whole)
+        result = validate_file_integrity(content, "app.docx")
+
+        assert result["valid"] and result["file_type"] == "docx"
+        assert result["warnings"] == []
+
+    def test_small_document_warned(self):
+        result = validate_file_integrity(make_docx("<w:document/>"), "app.docx")
+
+        assert "DOCX document.xml is unusually small." in result["warnings"]
+
+    def test_corrupted_document_rejected(self):
+        document_xml = "<w:document>" + "<w:p>Inventor: Jane Smith</w:p>" * 10 + "</w:document>"
+        content = make_docx(document_xml)
+        # Flip one byte of the stored document.xml so its CRC check fails
+        offset = content.index(b"Inventor: Jane Smith")
+        content = content[:offset] + b"X" + content[offset + 1:]
+
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_file_integrity(content, "app.docx")
+
+        assert exc_info.value.error_code == "DOCX_CORRUPTED"
+
+    def test_missing_document_rejected(self):
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_file_integrity(make_docx(None), "app.docx")
+
+        assert exc_info.value.error_code == "DOCX_INVALID_STRUCTURE"
+
+
+class TestPageTextPrecheck:
+    """Test the cheap per-page check run before pypdf text extraction"""
+
+    def test_page_may_have_text(self):
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer)
+        pdf.drawString(72, 720, "Inventor: Jane Smith")
+        pdf.showPage()
+        pdf.beginForm("header")
+        pdf.drawString(72, 720, "Application Data Sheet")
+        pdf.endForm()
+        pdf.doForm("header")
+        pdf.showPage()
+        pdf.save()
+
+        pages = list(PdfReader(io.BytesIO(buffer.getvalue())).pages)
+        pages += PdfReader(io.BytesIO(make_blank_pdf(1))).pages
+
+        assert [_page_may_have_text(page) for page in pages] == [True, True, False]
+
+    def test_blank_pages_skip_extraction(self, monkeypatch):
+        monkeypatch.setattr(file_validators, "fitz", None)
+        reader = PdfReader(io.BytesIO(make_blank_pdf(3)))
+        extracted = []
+        for page in reader.pages:
+            monkeypatch.setattr(page, "extract_text", lambda: extracted.append(1) or "")
+
+        assessment = assess_pdf_text_content(b"", reader=reader)
+
+        assert extracted == []
+        assert assessment["recommendation"] == "vision"
+
+
+class TestTextAssessment:
+    """Test PDF text assessment and its early exit"""
+
+    def test_scanning_stops_once_text_is_certain(self, monkeypatch):
+        monkeypatch.setattr(file_validators, "fitz", None)
+        content = make_pdf(["Inventor: Jane Smith, 1 Main St, Boston, MA 02115 " * 8] * 10)
+        reader = PdfReader(io.BytesIO(content))
+        extracted = []
+        for page in reader.pages:
+            original = page.extract_text
+            monkeypatch.setattr(
+                page, "extract_text", lambda original=original: extracted.append(1) or original()
+            )
+
+        assessment = assess_pdf_text_content(content, reader=reader)
+
+        assert len(extracted) < 10
+        assert assessment["total_pages"] == 10
+        assert assessment["recommendation"] == "text"
+
+    @pytest.mark.skipif(file_validators.fitz is None, reason="PyMuPDF is not installed")
+    def test_fitz_counts_match_pypdf(self):
+        content = make_pdf(["Inventor: Jane Smith, 1 Main St, Boston, MA 02115", None, "Title"])
+
+        assert _count_pdf_text_fitz(content) == _count_pdf_text_pypdf(content) == (54, 1, 3)
+
+    @pytest.mark.skipif(file_validators.fitz is None, reason="PyMuPDF is not installed")
+    def test_fitz_stops_once_text_is_certain(self):
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for _ in range(10):
+            for line in range(8):
+                pdf.drawString(72, 720 - 14 * line, "Inventor: Jane Smith, 1 Main St, Boston, MA 02115")
+            pdf.showPage()
+        pdf.save()
+
+        total_chars, pages_with_text, num_pages = _count_pdf_text_fitz(buffer.getvalue())
+
+        assert num_pages == 10
+        assert pages_with_text < 10
+        assert total_chars > 100 * num_pages
+
+    @pytest.mark.skipif(file_validators.fitz is None, reason="PyMuPDF is not installed")
+    @pytest.mark.parametrize("content", [
+        make_pdf(["Inventor: Jane Smith"])[:-200],
+        b"Inventor: Jane Smith",
+    ])
+    def test_fitz_defers_damaged_input_to_pypdf(self, content):
+        assert _count_pdf_text_fitz(content) is None
+
+
+class TestValidateBeforeExtraction:
+    """Test the pre-extraction gate run by the job service"""
+
+    def test_pdf_with_leading_junk_accepted(self):
+        content = b"junk before header\r\n" * 10 + make_pdf(["Inventor: Jane Smith " * 10] * 3)
+
+        result = validate_before_extraction(content, "pdf")
+
+        assert result["page_count"] == 3
+        assert result["extraction_strategy"] == "text"
+
+    def test_pdf_header_past_search_limit_rejected(self):
+        content = b"x" * 2048 + make_pdf(["Inventor: Jane Smith"])
+
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_before_extraction(content, "pdf")
+
+        assert exc_info.value.error_code == "TYPE_MISMATCH"
+
+    def test_docx_claimed_as_pdf_rejected(self):
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_before_extraction(make_docx(), "pdf")
+
+        assert exc_info.value.error_code == "TYPE_MISMATCH"
+
+    def test_docx_accepted(self):
+        result = validate_before_extraction(make_docx(), "docx")
+
+        assert result["extraction_strategy"] == "docx_text"
+
+    def test_oversized_file_rejected_before_parsing(self, monkeypatch):
+        monkeypatch.setattr(file_validators, "MAX_EXTRACTION_SIZE_MB", 0.001)
+        monkeypatch.setattr(file_validators, "PdfReader", None)
+        monkeypatch.setattr(file_validators, "fitz", None)
+
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_before_extraction(make_pdf(["Inventor: Jane Smith"] * 5), "pdf")
+
+        assert exc_info.value.error_code == "FILE_TOO_LARGE"